@@ -1,14 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import logging
 import sys
 import os
+from typing import Optional
 
-# 프로젝트 루트 디렉토리를 Python 경로에 추가
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# 프로젝트 루트 디렉토리를 Python 경로에 추가 (재실행마다 중복 추가하지 않음)
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
-from src.utils.data_manager import DataManager
-from src.utils.auction_manager import AuctionManager
-from src.utils.nba_data import NBADataCollector
+from src.utils.data_manager import EXPORT_COLUMNS
+from src.utils.app_state import init_session_state
+
+# 디버그 로그 (기본 레벨에서는 출력되지 않으며 메시지 포맷팅도 지연됨)
+logger = logging.getLogger(__name__)
 
 # 페이지 설정
 st.set_page_config(
@@ -18,139 +25,258 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 세션 상태 초기화
-if 'data_manager' not in st.session_state:
-    st.session_state.data_manager = DataManager()
-else:
-    # 이미 존재하는 경우에도 최신 상태 로드 (설정 변경 반영)
-    st.session_state.data_manager.load_state()
+# 세션 상태 초기화 (모든 페이지가 같은 DataManager/AuctionManager를 공유)
+init_session_state()
+
+# 자주 그려지는 팀 테이블의 고정 컬럼 설정 (레이아웃 재계산 방지)
+TEAM_COLUMN_CONFIG = {
+    '팀명': st.column_config.TextColumn(width='small'),
+    '뽑은 선수': st.column_config.TextColumn(width='small'),
+    '선수 수': st.column_config.TextColumn(width='small'),
+    '남은 예산': st.column_config.TextColumn(width='small'),
+    '사용한 예산': st.column_config.TextColumn(width='small'),
+    '최근 영입 선수': st.column_config.TextColumn(width='large'),
+    '총 득점': st.column_config.TextColumn(width='small'),
+    '총 리바운드': st.column_config.TextColumn(width='small'),
+    '총 어시스트': st.column_config.TextColumn(width='small'),
+    **{f'선수{i+1}': st.column_config.TextColumn(width='medium') for i in range(10)}
+}
+
+def _players_version() -> int:
+    """선수 데이터(players.parquet)가 바뀔 때만 갱신되는 버전을 반환합니다.
+
+    캐시 함수는 DataFrame 대신 이런 정수 버전만 인자로 받으므로
+    캐시 조회 시 DataFrame을 해싱하지 않습니다. 입찰처럼 상태만 바뀌는
+    경우에는 그대로이므로 선수 데이터만 쓰는 캐시는 이 값을 키로 사용합니다.
+    """
+    return st.session_state.data_manager.players_version
+
+def _teams_version() -> int:
+    """팀 구성(선수/예산/이름)이 바뀔 때만 갱신되는 버전을 반환합니다.
+
+    경매 시작/입찰/취소는 경매 상태만 바꾸므로 이 값은 그대로이고,
+    팀 테이블은 다시 만들어지지 않습니다.
+    """
+    return st.session_state.data_manager.teams_version
+
+# 읽기 전용 데이터 캐시 (_players_version() / _teams_version()을 키로 사용)
+@st.cache_data(max_entries=4)
+def _load_players_cached(players_version: int) -> pd.DataFrame:
+    """선수 데이터를 버전별로 캐시하여 반환합니다."""
+    return st.session_state.data_manager.load_players()
+
+@st.cache_data(max_entries=4)
+def _get_available_players_cached(players_version: int) -> pd.DataFrame:
+    """사용 가능한 선수 목록을 선수 데이터 버전별로 캐시하여 반환합니다."""
+    df = _load_players_cached(players_version)
+    if df.empty:
+        return df
+    return df[df['draft_status'] == 'available']
+
+@st.cache_data(max_entries=4)
+def _build_player_index(players_version: int) -> dict:
+    """선택 옵션("이름 (팀)") → 선수 정보 매핑을 반환합니다."""
+    df = _get_available_players_cached(players_version)
+    display_names = df['name'] + ' (' + df['team'].astype(str) + ')'
+
+    # 사이드바 카드에 필요한 컬럼만 레코드로 변환 (iterrows 대신 한 번에 변환)
+    card_columns = ['name', 'team', 'position', 'fantasy_rank',
+                    'points', 'rebounds', 'assists', 'steals', 'blocks']
+    return dict(zip(display_names, df[card_columns].to_dict('records')))
+
+@st.cache_data(max_entries=64)
+def _lookup_player_option(players_version: int, option: str) -> Optional[dict]:
+    """선택 옵션 하나에 해당하는 선수 정보를 반환합니다 (없으면 None).
+
+    전체 매핑 대신 레코드 하나만 캐시에서 꺼내므로 검색어 입력 시 재실행이 가볍습니다.
+    """
+    return _build_player_index(players_version).get(option)
+
+@st.cache_data(max_entries=64)
+def _search_player_options(players_version: int, query: str) -> tuple:
+    """검색어에 해당하는 selectbox 옵션(첫 항목은 "선수 선택...")을 반환합니다."""
+    options = ("선수 선택...",)
+    if len(query) >= 2:
+        matches = st.session_state.data_manager.search_players(query, limit=20)
+        options += tuple(matches['name'] + ' (' + matches['team'].astype(str) + ')')
+    return options
+
+@st.cache_data(max_entries=4)
+def _get_player_info_cached(players_version: int, player_name: str) -> dict:
+    """경매 중인 선수의 상세 정보를 선수 데이터 버전별로 캐시하여 반환합니다."""
+    return st.session_state.auction_manager.get_player_info(player_name)
+
+@st.cache_data(max_entries=4)
+def _export_csv_cached(players_version: int) -> bytes:
+    """드래프트 결과 CSV를 선수 데이터 버전별로 캐시하여 바이트로 반환합니다."""
+    df = _load_players_cached(players_version)
+    if df.empty:
+        return b""
+    return df[EXPORT_COLUMNS].to_csv(index=False).encode('utf-8')
+
+@st.cache_data(max_entries=4)
+def _get_team_frame_cached(teams_version: int) -> pd.DataFrame:
+    """팀 요약 정보를 팀명 인덱스의 DataFrame으로 버전별로 캐시하여 반환합니다.
+
+    get_team_summary()는 버전마다 여기서 한 번만 호출되며, 팀 테이블들은
+    모두 이 DataFrame을 공유합니다.
+    """
+    team_summary = st.session_state.data_manager.get_team_summary()
+    if not team_summary:
+        return pd.DataFrame()
+    return pd.DataFrame.from_dict(team_summary, orient='index')
+
+@st.cache_data(max_entries=4)
+def _get_team_aggregates_cached(players_version: int) -> pd.DataFrame:
+    """드래프트된 선수들의 팀별 득점/리바운드/어시스트 합계를 반환합니다."""
+    return st.session_state.data_manager.get_team_stat_totals(['points', 'rebounds', 'assists'])
 
-if 'auction_manager' not in st.session_state:
-    st.session_state.auction_manager = AuctionManager(st.session_state.data_manager)
+@st.cache_data(max_entries=4)
+def _build_team_tables(teams_version: int, players_version: int) -> tuple:
+    """팀별 통계 요약/상세 선수 목록 테이블을 한 번에 만들어 반환합니다.
+
+    두 테이블은 같은 팀 데이터와 예산/선수 수 문자열을 공유하므로 팀 데이터를
+    한 번만 훑어 함께 만듭니다. 반환값: (df_summary, df_roster)
+    """
+    max_display_players = 10  # 표시할 최대 선수 수를 10명으로 고정
+
+    # 팀 순서 정의 (상세 선수 목록용)
+    team_order = ["윤범", "수현", "철웅", "두현", "진빈", "원준", "단열", "지원", "정명", "준희", "병욱", "경찬"]
+
+    team_frame = _get_team_frame_cached(teams_version)
+    if team_frame.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    # 두 테이블이 공유하는 문자열 컬럼
+    team_names = team_frame.index
+    player_counts = team_frame['player_count'].astype(str) + '/15'
+    budgets_left = '$' + team_frame['budget_left'].astype(str)
+    budgets_spent = '$' + team_frame['total_spent'].astype(str)
+
+    roster_cells = [[p['display'] for p in players[:max_display_players]]
+                    for players in team_frame['players']]
+
+    # 팀별 스탯 합계 (드래프트된 선수가 없는 팀은 0)
+    totals = _get_team_aggregates_cached(players_version).reindex(team_names, fill_value=0.0)
+    df_summary = pd.DataFrame({
+        '팀명': team_names,
+        '선수 수': player_counts,
+        '남은 예산': budgets_left,
+        '사용한 예산': budgets_spent,
+        '총 득점': totals['points'].map('{:.1f}'.format),
+        '총 리바운드': totals['rebounds'].map('{:.1f}'.format),
+        '총 어시스트': totals['assists'].map('{:.1f}'.format)
+    })
+
+    # 상세 선수 목록: 팀 수 x 13 컬럼 배열을 미리 할당하고 행 단위로 채움
+    columns = ['팀명', '남은 예산', '선수 수'] + [f'선수{i+1}' for i in range(max_display_players)]
+    table = np.full((len(team_frame), len(columns)), '', dtype=object)
+    table[:, 0] = team_names
+    table[:, 1] = budgets_left
+    table[:, 2] = player_counts
+    for row, cells in enumerate(roster_cells):
+        table[row, 3:3 + len(cells)] = cells
+    df_roster = pd.DataFrame(table, index=team_names, columns=columns)
+    df_roster = df_roster.loc[[name for name in team_order if name in df_roster.index]]
+
+    return df_summary, df_roster
 
 def display_current_auction():
     """현재 경매 정보를 표시합니다."""
     auction_info = st.session_state.auction_manager.get_current_auction_info()
     
-    if auction_info['is_active']:
-        st.success(f"🔥 **현재 경매 중:** {auction_info['current_player']}")
-        
-        col1, col2, col3 = st.columns(3)
+    # 진행 중인 경매가 없으면 선수 정보/입찰 히스토리 조회 없이 바로 종료
+    if not auction_info['is_active']:
+        st.info("현재 진행 중인 경매가 없습니다.")
+        return
+    
+    st.success(f"🔥 **현재 경매 중:** {auction_info['current_player']}")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("현재 최고가", f"${auction_info['highest_bid']}")
+    with col2:
+        st.metric("최고 입찰자", auction_info['highest_bidder'])
+    with col3:
+        st.metric("다음 최소가", f"${auction_info['next_min_bid']}")
+    
+    # 선수 정보 (컴팩트, 입찰로는 바뀌지 않으므로 선수 데이터 버전으로 캐시)
+    player_info = _get_player_info_cached(
+        _players_version(), auction_info['current_player']
+    )
+    if player_info:
+        # 선수 기본 정보 (한 줄)
+        st.markdown(f"**{player_info['name']}** | {player_info['team']} {player_info['position']} | 순위 #{player_info['fantasy_rank']}")
+
+        # 스탯 (한 줄에 5개)
+        col1, col2, col3, col4, col5 = st.columns(5)
         with col1:
-            st.metric("현재 최고가", f"${auction_info['highest_bid']}")
+            st.metric("득점", f"{player_info['points']:.1f}")
         with col2:
-            st.metric("최고 입찰자", auction_info['highest_bidder'])
+            st.metric("리바운드", f"{player_info['rebounds']:.1f}")
         with col3:
-            st.metric("다음 최소가", f"${auction_info['next_min_bid']}")
-        
-        # 선수 정보 (컴팩트)
-        player_info = st.session_state.auction_manager.get_player_info(auction_info['current_player'])
-        if player_info:
-            # 선수 기본 정보 (한 줄)
-            st.markdown(f"**{player_info['name']}** | {player_info['team']} {player_info['position']} | 순위 #{player_info['fantasy_rank']}")
-
-            # 스탯 (한 줄에 5개)
-            col1, col2, col3, col4, col5 = st.columns(5)
-            with col1:
-                st.metric("득점", f"{player_info['points']:.1f}")
-            with col2:
-                st.metric("리바운드", f"{player_info['rebounds']:.1f}")
-            with col3:
-                st.metric("어시스트", f"{player_info['assists']:.1f}")
-            with col4:
-                st.metric("스틸", f"{player_info['steals']:.1f}")
-            with col5:
-                st.metric("블록", f"{player_info['blocks']:.1f}")
-        
-        # 입찰 히스토리
-        bid_history = st.session_state.auction_manager.get_bid_history()
-        if bid_history:
-            st.markdown("### 입찰 히스토리")
-            df_history = pd.DataFrame(bid_history)
-            st.dataframe(df_history, width='stretch')
+            st.metric("어시스트", f"{player_info['assists']:.1f}")
+        with col4:
+            st.metric("스틸", f"{player_info['steals']:.1f}")
+        with col5:
+            st.metric("블록", f"{player_info['blocks']:.1f}")
     
-    else:
-        st.info("현재 진행 중인 경매가 없습니다.")
-
-def player_search_section():
+    # 입찰 히스토리
+    df_history = st.session_state.auction_manager.get_bid_history_df()
+    if not df_history.empty:
+        st.markdown("### 입찰 히스토리")
+        st.dataframe(df_history, width='stretch')
+
+@st.fragment
+def player_search_section(available_count: int):
     """선수 검색 섹션 (사이드바용으로 최적화)"""
-    # 사용 가능한 모든 선수 목록 가져오기
-    available_players = st.session_state.data_manager.get_available_players()
-
-    if available_players.empty:
+    if available_count == 0:
         st.warning("선수 데이터가 없습니다.")
         return
 
-    # 선수 이름 목록 생성 (팀 정보 포함)
-    player_options = []
-    player_data_map = {}
-
-    for _, player in available_players.iterrows():
-        display_name = f"{player['name']} ({player['team']})"
-        player_options.append(display_name)
-        player_data_map[display_name] = player
-
-    # 정렬된 옵션 생성 (selectbox와 일치)
-    sorted_player_options = sorted(player_options)
-    sorted_player_data_map = {name: player_data_map[name] for name in sorted_player_options}
-
-    # 자동완성 selectbox
-    # 검색에서 선택된 선수가 있으면 기본값으로 설정
-    default_index = 0
-    if hasattr(st.session_state, 'selected_player_from_search'):
-        search_selection = st.session_state.selected_player_from_search
-        print(f"DEBUG: 검색에서 선택된 선수: {search_selection}")
-
-        if search_selection in sorted_player_options:
-            try:
-                default_index = sorted_player_options.index(search_selection) + 1
-                print(f"DEBUG: 기본 인덱스 설정: {default_index}")
-            except ValueError:
-                print(f"DEBUG: 인덱스 찾기 실패: {search_selection}")
-                default_index = 0
-        else:
-            print(f"DEBUG: 정렬된 옵션에서 찾을 수 없음: {search_selection}")
-            print(f"DEBUG: 사용 가능한 첫 5개 옵션: {sorted_player_options[:5]}")
+    # 2글자 이상 입력했을 때만 검색 결과로 selectbox 옵션 구성
+    search_query = st.text_input(
+        "이름으로 검색",
+        placeholder="예: LeBron (2글자 이상)",
+        key="player_search_query"
+    )
 
-        # 한 번 사용한 후 삭제
-        delattr(st.session_state, 'selected_player_from_search')
+    # 같은 검색어로 다시 실행될 때는 캐시된 옵션 튜플을 그대로 사용
+    search_key = search_query.strip().lower()
+    player_options = _search_player_options(_players_version(), search_key)
+    if len(search_key) >= 2 and len(player_options) == 1:
+        st.info("검색 결과 없음")
 
     selected_option = st.selectbox(
         "선수 선택",
-        options=["선수 선택..."] + sorted_player_options,
-        index=default_index,
-        help="선수 이름을 타이핑하면 자동완성됩니다",
+        options=player_options,
+        help="검색어를 입력하면 일치하는 선수가 표시됩니다",
         key="player_selectbox"
     )
 
-    # 텍스트 검색도 병행 제공
-    search_query = st.text_input(
-        "이름으로 검색",
-        placeholder="예: LeBron"
-    )
-
     selected_player = None
 
     # selectbox에서 선수가 선택된 경우
     if selected_option != "선수 선택...":
-        selected_player = sorted_player_data_map[selected_option]
-        print(f"DEBUG: selectbox에서 선택된 선수: {selected_player['name']}")
+        selected_player = _lookup_player_option(_players_version(), selected_option)
+        logger.debug("selectbox에서 선택된 선수: %s", selected_player['name'])
         # 선택된 선수를 세션 상태에 저장
         st.session_state.current_selected_player = selected_player
     # selectbox에서 선택이 안 되어 있어도 세션 상태에 저장된 선수가 있으면 사용
-    elif hasattr(st.session_state, 'current_selected_player') and st.session_state.current_selected_player is not None:
+    elif st.session_state.get('current_selected_player') is not None:
         # 세션에 저장된 선수가 아직 available한지 확인
-        saved_player = st.session_state.current_selected_player
-        player_name = saved_player['name'] if isinstance(saved_player, dict) else saved_player.get('name', '')
+        saved_player = st.session_state['current_selected_player']
+        player_name = saved_player.get('name', '')
+        saved_option = f"{player_name} ({saved_player.get('team', '')})"
 
-        # available_players에서 해당 선수 찾기
-        if not available_players.empty and not available_players[available_players['name'] == player_name].empty:
+        # 옵션 하나만 조회 (available 선수 전체를 훑지 않음)
+        if _lookup_player_option(_players_version(), saved_option) is not None:
             selected_player = saved_player
-            print(f"DEBUG: 세션 상태에서 선수 복원: {player_name}")
+            logger.debug("세션 상태에서 선수 복원: %s", player_name)
         else:
             # 더 이상 available하지 않은 선수면 세션 상태에서 제거
-            print(f"DEBUG: 선수 {player_name}는 더 이상 available하지 않음, 세션 상태 정리")
-            delattr(st.session_state, 'current_selected_player')
+            logger.debug("선수 %s는 더 이상 available하지 않음, 세션 상태 정리", player_name)
+            st.session_state.pop('current_selected_player', None)
 
     # 선수가 선택되었으면 정보 표시
     if selected_player is not None:
@@ -167,52 +293,33 @@ def player_search_section():
 
         # 경매 시작 버튼
         if st.button("🔥 경매 시작", type="primary", key="auction_start_sidebar", use_container_width=True):
-            print(f"DEBUG: 경매 시작 버튼 클릭 - 선수: {selected_player['name']}")
+            logger.debug("경매 시작 버튼 클릭 - 선수: %s", selected_player['name'])
 
             # 현재 경매 상태 확인
             current_auction = st.session_state.auction_manager.get_current_auction_info()
             if current_auction['is_active']:
                 st.error(f"이미 {current_auction['current_player']} 경매가 진행 중입니다.")
             else:
-                print(f"DEBUG: 경매 시작 시도 - 선수명: {selected_player['name']}")
+                logger.debug("경매 시작 시도 - 선수명: %s", selected_player['name'])
                 success = st.session_state.auction_manager.start_player_auction(selected_player['name'])
-                print(f"DEBUG: 경매 시작 결과: {success}")
+                logger.debug("경매 시작 결과: %s", success)
 
                 if success:
                     st.success(f"{selected_player['name']} 경매 시작!")
-                    st.rerun()
+                    st.rerun(scope="app")
                 else:
                     st.error("경매 시작 실패")
 
-    # 텍스트 검색 결과
-    elif search_query:
-        search_results = st.session_state.data_manager.search_players(search_query, limit=3)
-
-        if not search_results.empty:
-            st.markdown("**검색 결과:**")
-
-            # 간단한 목록 형태로 표시
-            for idx, (_, player) in enumerate(search_results.iterrows()):
-                if st.button(
-                    f"{player['name']} ({player['team']})",
-                    key=f"search_select_{idx}",
-                    use_container_width=True
-                ):
-                    # 선택된 선수를 selectbox에 반영하기 위해 세션 상태 사용
-                    display_name = f"{player['name']} ({player['team']})"
-                    print(f"DEBUG: 검색 결과에서 선수 선택: {display_name}")
-                    # 기존 세션 상태 정리
-                    if hasattr(st.session_state, 'current_selected_player'):
-                        delattr(st.session_state, 'current_selected_player')
-                    st.session_state.selected_player_from_search = display_name
-                    st.rerun()
-        else:
-            st.info("검색 결과 없음")
-    
+def _select_quick_bid(bid: int):
+    """빠른 입찰 버튼 콜백: 입찰가 입력 값을 선택한 금액으로 바꿉니다."""
+    st.session_state.sidebar_bid_input = bid
 
+@st.fragment
 def auction_control_section():
     """경매 제어 섹션 (사이드바 최적화)"""
-    auction_info = st.session_state.auction_manager.get_current_auction_info()
+    # 경매 정보/팀 예산/추천 입찰가를 한 번에 가져옴
+    snapshot = st.session_state.auction_manager.snapshot()
+    auction_info = snapshot['auction']
 
     if auction_info['is_active']:
         # 현재 경매 중인 선수 표시
@@ -220,35 +327,30 @@ def auction_control_section():
         st.caption(f"최고가: ${auction_info['highest_bid']} ({auction_info['highest_bidder']})")
 
         # 팀 선택
-        team_names = list(st.session_state.data_manager.teams.keys())
-        selected_team = st.selectbox("입찰 팀", team_names, key="sidebar_team_select")
+        team_budgets = snapshot['budgets']
+        selected_team = st.selectbox("입찰 팀", list(team_budgets), key="sidebar_team_select")
 
         if selected_team:
-            budget_left = st.session_state.data_manager.teams[selected_team].budget_left
-            st.caption(f"남은 예산: ${budget_left}")
+            st.caption(f"남은 예산: ${team_budgets[selected_team]}")
 
         # 빠른 입찰가 버튼들
-        suggested_bids = st.session_state.auction_manager.get_suggested_bids()
+        suggested_bids = snapshot['suggestions']
         if suggested_bids and len(suggested_bids) > 1:
             st.caption("빠른 입찰:")
             cols = st.columns(min(len(suggested_bids), 4))
             for i, bid in enumerate(suggested_bids[:4]):
                 with cols[i]:
-                    if st.button(f"${bid}", key=f"quick_bid_{bid}", use_container_width=True):
-                        st.session_state.quick_bid_selected = bid
-                        st.rerun()
-
-        # 입찰가 입력 (수기 입력)
-        # 빠른 입찰 버튼이 눌렸을 때 해당 값으로 초기화
-        initial_value = auction_info['next_min_bid']
-        if hasattr(st.session_state, 'quick_bid_selected'):
-            initial_value = st.session_state.quick_bid_selected
-            del st.session_state.quick_bid_selected
-
+                    # 콜백에서 입찰가 입력 값을 바로 바꾸므로 따로 다시 실행하지 않음
+                    st.button(f"${bid}", key=f"quick_bid_{bid}", use_container_width=True,
+                              on_click=_select_quick_bid, args=(bid,))
+
+        # 입찰가 입력 (수기 입력, 빠른 입찰 버튼이 눌리면 해당 값으로 바뀜)
+        # 값은 세션 상태로만 관리하며, 최소 입찰가보다 낮으면 최소 입찰가로 맞춤
+        if st.session_state.get('sidebar_bid_input', 0) < auction_info['next_min_bid']:
+            st.session_state.sidebar_bid_input = auction_info['next_min_bid']
         selected_bid = st.number_input(
             "입찰가 ($)",
             min_value=auction_info['next_min_bid'],
-            value=initial_value,
             step=1,
             key="sidebar_bid_input",
             help=f"최소 입찰가: ${auction_info['next_min_bid']}"
@@ -259,7 +361,7 @@ def auction_control_section():
             success, message = st.session_state.auction_manager.place_bid(selected_team, selected_bid)
             if success:
                 st.success("입찰 성공!")
-                st.rerun()
+                st.rerun(scope="app")
             else:
                 st.error(message)
 
@@ -269,10 +371,9 @@ def auction_control_section():
                 success, message = st.session_state.auction_manager.finalize_current_auction()
                 if success:
                     # 경매 완료 후 세션 상태 정리
-                    if hasattr(st.session_state, 'current_selected_player'):
-                        delattr(st.session_state, 'current_selected_player')
+                    st.session_state.pop('current_selected_player', None)
                     st.success("낙찰!")
-                    st.rerun()
+                    st.rerun(scope="app")
                 else:
                     st.error(message)
 
@@ -280,15 +381,15 @@ def auction_control_section():
             if st.button("❌ 취소", key="sidebar_cancel_btn", use_container_width=True):
                 if st.session_state.auction_manager.cancel_current_auction():
                     # 경매 취소 후 세션 상태 정리
-                    if hasattr(st.session_state, 'current_selected_player'):
-                        delattr(st.session_state, 'current_selected_player')
+                    st.session_state.pop('current_selected_player', None)
                     st.info("경매 취소됨")
-                    st.rerun()
+                    st.rerun(scope="app")
 
     else:
         st.info("진행 중인 경매가 없습니다.")
         st.caption("👈 아래에서 선수를 선택하고 경매를 시작하세요.")
 
+@st.fragment
 def team_settings_section():
     """팀 설정 섹션"""
     st.markdown("## 팀 설정")
@@ -305,7 +406,7 @@ def team_settings_section():
                     success = st.session_state.data_manager.update_team_name(selected_team, new_name)
                     if success:
                         st.success(f"{selected_team} → {new_name}으로 변경되었습니다!")
-                        st.rerun()
+                        st.rerun(scope="app")
                     else:
                         st.error("팀 이름 변경에 실패했습니다.")
                 else:
@@ -317,66 +418,44 @@ def team_overview_dashboard():
     """팀별 현황 대시보드 (표 형태)"""
     st.markdown("## 🏀 팀별 현황")
 
-    team_summary = st.session_state.data_manager.get_team_summary()
-
-    if not team_summary:
+    team_frame = _get_team_frame_cached(_teams_version())
+    if team_frame.empty:
         st.info("팀 정보를 불러올 수 없습니다.")
         return
 
-    # 팀별 현황을 표 형태로 구성
-    team_overview_data = []
-
-    for team_name, team_data in team_summary.items():
-        # 최근 뽑은 선수 3명만 표시
-        recent_players = []
-        if team_data['players']:
-            for player in team_data['players'][-3:]:  # 최근 3명
-                recent_players.append(f"{player['name']} (${player['price']})")
-
-        recent_players_str = " / ".join(recent_players) if recent_players else "없음"
-
-        team_overview_data.append({
-            '팀명': team_name,
-            '뽑은 선수': f"{team_data['player_count']}/15",
-            '남은 예산': f"${team_data['budget_left']}",
-            '사용한 예산': f"${team_data['total_spent']}",
-            '최근 영입 선수': recent_players_str
-        })
-
-    if team_overview_data:
-        df_overview = pd.DataFrame(team_overview_data)
-        st.dataframe(df_overview, width='stretch', hide_index=True, height=400)
-
-def roster_board_section():
+    # 최근 뽑은 선수 3명만 표시
+    recent_players = [" / ".join(f"{p['name']} (${p['price']})" for p in players[-3:]) or "없음"
+                      for players in team_frame['players']]
+    df_overview = pd.DataFrame({
+        '팀명': team_frame.index,
+        '뽑은 선수': team_frame['player_count'].astype(str) + '/15',
+        '남은 예산': '$' + team_frame['budget_left'].astype(str),
+        '사용한 예산': '$' + team_frame['total_spent'].astype(str),
+        '최근 영입 선수': recent_players
+    })
+    st.dataframe(df_overview, column_config=TEAM_COLUMN_CONFIG, hide_index=True, height=400)
+
+def roster_board_section(df_summary: pd.DataFrame):
     """팀별 통계 요약 섹션"""
     with st.expander("📊 팀별 통계 요약", expanded=False):
-        team_summary = st.session_state.data_manager.get_team_summary()
-
-        team_summary_data = []
-        for team_name, team_data in team_summary.items():
-            total_points = sum(p['points'] for p in team_data['players']) if team_data['players'] else 0
-            total_rebounds = sum(p['rebounds'] for p in team_data['players']) if team_data['players'] else 0
-            total_assists = sum(p['assists'] for p in team_data['players']) if team_data['players'] else 0
-
-            team_summary_data.append({
-                '팀명': team_name,
-                '선수 수': f"{team_data['player_count']}/15",
-                '남은 예산': f"${team_data['budget_left']}",
-                '사용한 예산': f"${team_data['total_spent']}",
-                '총 득점': f"{total_points:.1f}",
-                '총 리바운드': f"{total_rebounds:.1f}",
-                '총 어시스트': f"{total_assists:.1f}"
-            })
-
-        if team_summary_data:
-            df_summary = pd.DataFrame(team_summary_data)
-            st.dataframe(df_summary, width='stretch', hide_index=True)
+        if not df_summary.empty:
+            st.dataframe(df_summary, column_config=TEAM_COLUMN_CONFIG, hide_index=True)
         else:
             st.info("팀 정보를 불러올 수 없습니다.")
 
 def main():
-    """메인 앱"""
+    """메인 앱
+
+    사이드바의 선수 검색/경매 제어/팀 설정 섹션은 st.fragment로 분리되어
+    해당 섹션의 위젯 조작 시 팀 현황 테이블 등 나머지 페이지는 다시 그리지
+    않습니다. 전체 상태를 바꾸는 동작은 st.rerun(scope="app")으로 전체를 갱신합니다.
+    """
     st.title("🏀 NBA Fantasy Auction Tool")
+
+    # 이번 실행에서 사용할 데이터를 한 번만 가져와 각 섹션에 전달
+    players_version = _players_version()
+    teams_version = _teams_version()
+    player_counts = st.session_state.data_manager.get_player_counts()
     
     # 사이드바
     with st.sidebar:
@@ -390,7 +469,7 @@ def main():
         st.markdown("## 🎯 선수 검색")
 
         # 선수 검색 섹션
-        player_search_section()
+        player_search_section(player_counts['available'])
 
         st.divider()
 
@@ -406,8 +485,7 @@ def main():
             if st.button("⚠️ 드래프트 초기화 실행", type="primary", use_container_width=True, key="reset_draft_btn"):
                 if st.session_state.data_manager.reset_draft():
                     # 세션 상태도 정리
-                    if hasattr(st.session_state, 'current_selected_player'):
-                        delattr(st.session_state, 'current_selected_player')
+                    st.session_state.pop('current_selected_player', None)
                     st.success("드래프트가 초기화되었습니다!")
                     st.rerun()
                 else:
@@ -423,12 +501,11 @@ def main():
         st.markdown("## 📊 데이터 현황")
 
         # 데이터 상태 확인
-        df = st.session_state.data_manager.load_players()
-        if df.empty:
+        if player_counts['total'] == 0:
             st.warning("선수 데이터가 없습니다. 설정에서 데이터를 불러오세요.")
         else:
-            available_count = len(st.session_state.data_manager.get_available_players())
-            drafted_count = len(st.session_state.data_manager.get_drafted_players())
+            available_count = player_counts['available']
+            drafted_count = player_counts['drafted']
 
             col1, col2 = st.columns(2)
             with col1:
@@ -440,17 +517,9 @@ def main():
 
         st.markdown("## 💾 내보내기")
 
-        # CSV 내보내기 (바로 다운로드)
-        df = st.session_state.data_manager.load_players()
-        if not df.empty:
-            # 드래프트 결과 데이터 준비
-            export_df = df[['name', 'team', 'position', 'draft_status',
-                          'draft_price', 'draft_team', 'points', 'rebounds',
-                          'assists', 'steals', 'blocks', 'fantasy_rank']].copy()
-
-            # CSV 문자열로 변환
-            csv_data = export_df.to_csv(index=False, encoding='utf-8')
-
+        # CSV 내보내기 (바로 다운로드, 버전별 캐시)
+        csv_data = _export_csv_cached(players_version)
+        if csv_data:
             # 파일명 생성
             from datetime import datetime
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -477,47 +546,18 @@ def main():
     # 2. 팀별 상세 선수 목록
     st.markdown("### 📋 팀별 상세 선수 목록")
 
-    team_summary = st.session_state.data_manager.get_team_summary()
-
-    # 모든 팀의 데이터를 하나의 테이블로 구성 (선수 컬럼 10개 고정)
-    team_roster_data = []
-    max_display_players = 10  # 표시할 최대 선수 수를 10명으로 고정
-
-    # 팀 순서 정의
-    team_order = ["윤범", "수현", "철웅", "두현", "진빈", "원준", "단열", "지원", "정명", "준희", "병욱", "경찬"]
+    # 팀 테이블들을 한 번에 구성 (버전별 캐시)
+    df_summary, df_roster = _build_team_tables(teams_version, players_version)
 
-    # 정의된 순서대로 팀 데이터 처리
-    for team_name in team_order:
-        if team_name not in team_summary:
-            continue
-        team_data = team_summary[team_name]
-        row_data = {
-            '팀명': team_name,
-            '남은 예산': f"${team_data['budget_left']}",
-            '선수 수': f"{team_data['player_count']}/15"
-        }
-
-        # 각 선수를 별도 컬럼으로 추가 (최대 10명까지)
-        for i, player in enumerate(team_data['players'][:max_display_players]):
-            player_info = f"{player['name']} ({player['position']}) ${player['price']}"
-            row_data[f'선수{i+1}'] = player_info
-
-        # 빈 선수 슬롯은 빈 문자열로 채움 (항상 10개 컬럼 유지)
-        for i in range(len(team_data['players']), max_display_players):
-            row_data[f'선수{i+1}'] = ""
-
-        team_roster_data.append(row_data)
-
-    if team_roster_data:
-        df_roster = pd.DataFrame(team_roster_data)
-        st.dataframe(df_roster, width='stretch', hide_index=True, height=460)
+    if not df_roster.empty:
+        st.dataframe(df_roster, column_config=TEAM_COLUMN_CONFIG, hide_index=True, height=460)
     else:
         st.info("팀 정보를 불러올 수 없습니다.")
 
     st.divider()
 
     # 5. 상세 통계는 확장 가능한 섹션으로
-    roster_board_section()
+    roster_board_section(df_summary)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,12 +2,17 @@ import streamlit as st
 import sys
 import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
-# 프로젝트 루트 디렉토리를 Python 경로에 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 프로젝트 루트 디렉토리를 Python 경로에 추가 (재실행마다 중복 추가하지 않음)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 
 from src.utils.nba_data import NBADataCollector
-from src.utils.data_manager import DataManager
+from src.utils.app_state import init_session_state, reset_data_manager
 
 st.set_page_config(
     page_title="설정 - NBA Fantasy Auction Tool",
@@ -17,9 +22,24 @@ st.set_page_config(
 
 st.title("⚙️ 설정")
 
-# 세션 상태 초기화
-if 'data_manager' not in st.session_state:
-    st.session_state.data_manager = DataManager()
+@st.cache_resource
+def get_collector() -> NBADataCollector:
+    """HTTP 세션을 재사용하도록 데이터 수집기를 프로세스 전체에서 한 번만 생성합니다."""
+    return NBADataCollector()
+
+# 미리보기에 표시할 컬럼
+PREVIEW_COLUMNS = [
+    'name', 'team', 'position', 'points', 'rebounds', 'assists',
+    'steals', 'blocks', 'fantasy_rank', 'draft_status', 'draft_team', 'draft_price'
+]
+
+@st.cache_resource(max_entries=4)
+def _get_preview_table(players_version: int) -> pa.Table:
+    """미리보기 컬럼만 Parquet 파일에서 바로 읽은 Arrow 테이블을 선수 데이터 버전별로 반환합니다."""
+    return pq.read_table(st.session_state.data_manager.players_file, columns=PREVIEW_COLUMNS)
+
+# 세션 상태 초기화 (메인 페이지와 같은 DataManager를 공유)
+init_session_state()
 
 def data_collection_section():
     """데이터 수집 섹션"""
@@ -33,8 +53,9 @@ def data_collection_section():
     with col1:
         if not df.empty:
             st.info(f"현재 선수 데이터: {len(df)}명")
-            st.metric("사용 가능한 선수", len(df[df['draft_status'] == 'available']))
-            st.metric("드래프트된 선수", len(df[df['draft_status'] == 'drafted']))
+            player_counts = st.session_state.data_manager.get_player_counts()
+            st.metric("사용 가능한 선수", player_counts['available'])
+            st.metric("드래프트된 선수", player_counts['drafted'])
         else:
             st.warning("선수 데이터가 없습니다.")
     
@@ -56,7 +77,7 @@ def data_collection_section():
             
             with st.spinner("NBA 선수 데이터를 수집하는 중..."):
                 try:
-                    collector = NBADataCollector()
+                    collector = get_collector()
                     
                     # 진행상황 표시
                     progress_placeholder.info("🔍 활성 선수 목록을 가져오는 중...")
@@ -66,25 +87,22 @@ def data_collection_section():
                     
                     progress_placeholder.info("💾 데이터를 저장하는 중...")
                     
-                    # 데이터 저장 전 현재 상태 확인
-                    old_df = st.session_state.data_manager.load_players()
-                    old_count = len(old_df) if not old_df.empty else 0
+                    # 데이터 저장 전 현재 선수 수 확인 (DataFrame을 복사하지 않음)
+                    old_count = st.session_state.data_manager.get_player_counts()['total']
                     
-                    # 데이터 저장
+                    # 데이터 저장 (저장한 파일을 다시 읽지 않고 메모리에 있는 new_df로 결과 표시)
                     st.session_state.data_manager.save_players(new_df)
-                    
-                    # 저장 후 다시 로드해서 확인
-                    saved_df = st.session_state.data_manager.load_players()
+                    new_count = len(new_df)
                     
                     progress_placeholder.empty()
                     
-                    st.success(f"✅ {len(new_df)}명의 실시간 선수 데이터가 업데이트되었습니다!")
-                    st.info(f"📊 이전: {old_count}명 → 현재: {len(saved_df)}명")
+                    st.success(f"✅ {new_count}명의 실시간 선수 데이터가 업데이트되었습니다!")
+                    st.info(f"📊 이전: {old_count}명 → 현재: {new_count}명")
                     
                     # 실제 파일 존재 확인
-                    import os
-                    if os.path.exists("data/players.csv"):
-                        file_size = os.path.getsize("data/players.csv")
+                    players_file = st.session_state.data_manager.players_file
+                    if os.path.exists(players_file):
+                        file_size = os.path.getsize(players_file)
                         st.info(f"📁 파일 크기: {file_size:,} bytes")
                     
                     st.rerun()
@@ -100,17 +118,19 @@ def data_collection_section():
     with col2:
         if st.button("🗑️ 데이터 초기화"):
             if st.session_state.get('confirm_reset', False):
-                # 실제 초기화 수행
-                os.makedirs('data', exist_ok=True)
+                # 실제 초기화 수행 (예약된 저장을 먼저 써서 삭제 뒤에 다시 쓰이지 않도록 함)
+                data_manager = st.session_state.data_manager
+                data_manager.flush_state()
+                os.makedirs(data_manager.data_dir, exist_ok=True)
                 empty_df = pd.DataFrame()
-                st.session_state.data_manager.save_players(empty_df)
+                data_manager.save_players(empty_df)
                 
                 # 상태 파일도 초기화
-                state_file = 'data/state.json'
-                if os.path.exists(state_file):
-                    os.remove(state_file)
+                if os.path.exists(data_manager.state_file):
+                    os.remove(data_manager.state_file)
                 
-                st.session_state.data_manager = DataManager()
+                # 모든 세션이 새 DataManager를 사용하도록 공유 인스턴스를 교체
+                reset_data_manager()
                 st.session_state['confirm_reset'] = False
                 st.success("✅ 모든 데이터가 초기화되었습니다!")
                 st.rerun()
@@ -132,33 +152,27 @@ def data_collection_section():
             )
         
         with col2:
-            positions = ['전체'] + list(df['position'].unique())
+            # 범주형 컬럼이므로 전체 값을 훑지 않고 카테고리 목록을 바로 사용
+            positions = ['전체'] + list(df['position'].cat.categories)
             show_position = st.selectbox("포지션", positions)
         
         with col3:
-            teams = ['전체'] + list(df['team'].unique())
+            teams = ['전체'] + list(df['team'].cat.categories)
             show_team = st.selectbox("팀", teams)
         
-        # 필터링 적용
-        filtered_df = df.copy()
-        
-        if show_status != '전체':
-            filtered_df = filtered_df[filtered_df['draft_status'] == show_status]
-        
-        if show_position != '전체':
-            filtered_df = filtered_df[filtered_df['position'] == show_position]
+        # 미리보기용 Arrow 테이블(버전별 캐시)에서 바로 필터링 (pandas → Arrow 변환 생략)
+        table = _get_preview_table(st.session_state.data_manager.players_version)
         
-        if show_team != '전체':
-            filtered_df = filtered_df[filtered_df['team'] == show_team]
+        mask = None
+        for column, value in (('draft_status', show_status), ('position', show_position), ('team', show_team)):
+            if value != '전체':
+                condition = pc.equal(table[column], value)
+                mask = condition if mask is None else pc.and_(mask, condition)
         
-        # 표시할 컬럼 선택
-        display_columns = [
-            'name', 'team', 'position', 'points', 'rebounds', 'assists',
-            'steals', 'blocks', 'fantasy_rank', 'draft_status', 'draft_team', 'draft_price'
-        ]
+        filtered_table = table if mask is None else table.filter(mask)
         
         st.dataframe(
-            filtered_df[display_columns],
+            filtered_table,
             width='stretch',
             height=400
         )
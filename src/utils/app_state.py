@@ -0,0 +1,40 @@
+import streamlit as st
+
+from .data_manager import DataManager
+from .auction_manager import AuctionManager
+
+
+@st.cache_resource
+def get_data_manager() -> DataManager:
+    """프로세스 전체(모든 페이지/세션)에서 공유하는 DataManager를 반환합니다."""
+    return DataManager()
+
+
+@st.cache_resource
+def get_auction_manager(instance_id: int, _data_manager: DataManager) -> AuctionManager:
+    """DataManager에 연결된 AuctionManager를 반환합니다.
+    
+    _data_manager는 해시하지 않으므로 instance_id를 키로 사용하여
+    DataManager가 바뀌면 새 AuctionManager를 만듭니다.
+    """
+    return AuctionManager(_data_manager)
+
+
+def init_session_state():
+    """공유 매니저를 세션 상태에 연결하고 파일 변경 사항을 반영합니다.
+    
+    매 실행마다 호출하여 데이터 초기화 등으로 공유 DataManager가 바뀐 경우에도
+    모든 세션이 같은 인스턴스를 사용하도록 합니다. 상태/선수 파일은 바뀐 경우에만
+    실제로 읽고 버전을 올리므로, 버전을 키로 쓰는 캐시보다 먼저 호출해야 합니다.
+    """
+    data_manager = get_data_manager()
+    st.session_state.data_manager = data_manager
+    st.session_state.auction_manager = get_auction_manager(data_manager.instance_id, data_manager)
+    data_manager.load_state()
+
+
+def reset_data_manager():
+    """공유 DataManager와 연결된 AuctionManager 캐시를 비우고 세션 상태를 다시 연결합니다."""
+    get_data_manager.clear()
+    get_auction_manager.clear()
+    init_session_state()
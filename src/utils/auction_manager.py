@@ -1,18 +1,36 @@
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
-from dataclasses import dataclass
+from collections import deque
+from functools import lru_cache
 from .data_manager import DataManager, Player
 
-@dataclass
-class BidHistory:
-    team_name: str
-    amount: int
-    timestamp: str
+# 보관할 최대 입찰 기록 수
+BID_HISTORY_MAXLEN = 256
+
+# get_player_info가 반환하는 선수 정보 컬럼
+PLAYER_INFO_COLUMNS = ['name', 'team', 'position', 'points', 'rebounds', 'assists',
+                       'steals', 'blocks', 'fantasy_value', 'fantasy_rank']
+
+# 최소 입찰가 외에 추천하는 추가 금액
+SUGGESTED_BID_INCREMENTS = (5, 10, 15, 20)
+
+@lru_cache(maxsize=1024)
+def _suggest_bids(current_bid: int, min_bid_increment: int, max_budget: int) -> Tuple[int, ...]:
+    """추천 입찰가를 계산합니다 (입력만으로 결과가 정해지므로 인자별로 캐시)."""
+    # 최소 입찰가 + 추가 추천가 (중복 제거, 순서 유지)
+    suggestions = dict.fromkeys(
+        [current_bid + min_bid_increment] + [current_bid + inc for inc in SUGGESTED_BID_INCREMENTS]
+    )
+    # 예산 범위 내에서만 반환
+    return tuple(bid for bid in suggestions if bid <= max_budget)
 
 class AuctionManager:
     def __init__(self, data_manager: DataManager):
         self.data_manager = data_manager
-        self.bid_history: List[BidHistory] = []
+        self.bid_history = deque(maxlen=BID_HISTORY_MAXLEN)  # (팀 이름, 입찰가, 시각) 튜플
+        self._bid_history_df: Optional[pd.DataFrame] = None  # 입찰 시에만 무효화되는 표시용 캐시
+        self._player_index = None  # (players_version, 사용 가능한 선수 이름 → 상세 정보)
+        self._team_budgets = None  # (teams_version, 팀 이름 → 남은 예산, 최대 남은 예산)
         self.min_bid_increment = 1
     
     def get_current_auction_info(self) -> Dict:
@@ -38,30 +56,44 @@ class AuctionManager:
             'next_min_bid': next_min_bid
         }
     
-    def get_player_info(self, player_name: str) -> Optional[Dict]:
-        """선수의 상세 정보를 반환합니다."""
-        df = self.data_manager.get_available_players()
-        if df.empty:
-            return None
-        
-        player_data = df[df['name'] == player_name]
-        if player_data.empty:
-            return None
-        
-        player = player_data.iloc[0]
+    def snapshot(self) -> Dict:
+        """경매 제어 화면에 필요한 정보를 한 번에 반환합니다.
+        
+        반환값: {'auction': get_current_auction_info(), 'budgets': 팀 이름 → 남은 예산,
+                 'suggestions': 추천 입찰가 목록}
+        """
+        auction_info = self.get_current_auction_info()
+        budgets, max_budget = self._get_budget_info()
+        suggestions = (
+            list(_suggest_bids(auction_info['highest_bid'], self.min_bid_increment, max_budget))
+            if auction_info['is_active'] else []
+        )
         return {
-            'name': player['name'],
-            'team': player['team'],
-            'position': player['position'],
-            'points': player['points'],
-            'rebounds': player['rebounds'],
-            'assists': player['assists'],
-            'steals': player['steals'],
-            'blocks': player['blocks'],
-            'fantasy_value': player['fantasy_value'],
-            'fantasy_rank': player['fantasy_rank']
+            'auction': auction_info,
+            'budgets': dict(budgets),
+            'suggestions': suggestions
         }
     
+    def get_player_info(self, player_name: str) -> Optional[Dict]:
+        """선수의 상세 정보를 반환합니다 (사용 가능한 선수만)."""
+        return self._get_player_index().get(player_name)
+    
+    def _get_player_index(self) -> Dict[str, Dict]:
+        """사용 가능한 선수 이름 → 상세 정보 딕셔너리를 선수 데이터 버전별로 캐시하여 반환합니다.
+        
+        낙찰되면 players_version이 바뀌므로 다음 조회 때 다시 만들어집니다.
+        다른 DataManager가 선수 파일을 바꾼 경우도 반영하도록 먼저 파일을 확인합니다.
+        """
+        self.data_manager.refresh_players()
+        players_version = self.data_manager.players_version
+        if self._player_index is None or self._player_index[0] != players_version:
+            df = self.data_manager.get_available_players(copy=False)
+            records = df[PLAYER_INFO_COLUMNS].to_dict('records') if not df.empty else []
+            # 같은 이름이 여러 명이면 첫 번째 선수 (역순으로 넣어 앞쪽 값이 남도록)
+            index = {record['name']: record for record in reversed(records)}
+            self._player_index = (players_version, index)
+        return self._player_index[1]
+    
     def start_player_auction(self, player_name: str) -> bool:
         """선수 경매를 시작합니다."""
         # 현재 다른 경매가 진행 중인지 확인
@@ -75,7 +107,8 @@ class AuctionManager:
         
         # 경매 시작
         self.data_manager.start_auction(player_name)
-        self.bid_history = []  # 입찰 히스토리 초기화
+        self.bid_history.clear()  # 입찰 히스토리 초기화
+        self._bid_history_df = None
         
         return True
     
@@ -103,11 +136,8 @@ class AuctionManager:
         success = self.data_manager.place_bid(team_name, amount)
         if success:
             from datetime import datetime
-            self.bid_history.append(BidHistory(
-                team_name=team_name,
-                amount=amount,
-                timestamp=datetime.now().strftime("%H:%M:%S")
-            ))
+            self.bid_history.append((team_name, amount, datetime.now().strftime("%H:%M:%S")))
+            self._bid_history_df = None
             return True, f"{team_name}이(가) ${amount}에 입찰했습니다."
         else:
             return False, "입찰에 실패했습니다."
@@ -139,35 +169,52 @@ class AuctionManager:
         # 경매 상태 초기화
         from .data_manager import AuctionState
         self.data_manager.auction_state = AuctionState()
-        self.data_manager.save_state()
-        self.bid_history = []
+        self.data_manager.schedule_save()
+        self.bid_history.clear()
+        self._bid_history_df = None
         
         return True
     
     def get_bid_history(self) -> List[Dict]:
         """입찰 히스토리를 반환합니다."""
         return [
-            {
-                'team': bid.team_name,
-                'amount': bid.amount,
-                'time': bid.timestamp
-            }
-            for bid in self.bid_history
+            {'team': team, 'amount': amount, 'time': timestamp}
+            for team, amount, timestamp in self.bid_history
         ]
     
+    def get_bid_history_df(self) -> pd.DataFrame:
+        """입찰 히스토리를 DataFrame으로 반환합니다 (입찰이 있을 때만 새로 만듦)."""
+        if self._bid_history_df is None:
+            self._bid_history_df = pd.DataFrame(
+                list(self.bid_history), columns=['team', 'amount', 'time']
+            )
+        return self._bid_history_df
+    
     def get_team_budgets(self) -> Dict[str, int]:
         """모든 팀의 남은 예산을 반환합니다."""
-        return {
-            team_name: team.budget_left
-            for team_name, team in self.data_manager.teams.items()
-        }
+        return dict(self._get_budget_info()[0])
+    
+    def _get_budget_info(self) -> Tuple[Dict[str, int], int]:
+        """(팀 이름 → 남은 예산, 최대 남은 예산)을 팀 데이터 버전별로 캐시하여 반환합니다.
+        
+        입찰로는 예산이 바뀌지 않고 낙찰/설정 변경 때만 teams_version이 바뀌므로
+        입찰 중에는 팀을 다시 훑지 않습니다.
+        """
+        teams_version = self.data_manager.teams_version
+        if self._team_budgets is None or self._team_budgets[0] != teams_version:
+            budgets = {
+                team_name: team.budget_left
+                for team_name, team in self.data_manager.teams.items()
+            }
+            self._team_budgets = (teams_version, budgets, max(budgets.values(), default=0))
+        return self._team_budgets[1:]
     
     def get_affordable_teams(self, amount: int) -> List[str]:
         """특정 금액을 입찰할 수 있는 팀 목록을 반환합니다."""
-        return [
-            team_name for team_name, team in self.data_manager.teams.items()
-            if team.budget_left >= amount
-        ]
+        budgets, max_budget = self._get_budget_info()
+        if amount > max_budget:
+            return []
+        return [team_name for team_name, budget in budgets.items() if budget >= amount]
     
     def validate_bid_amount(self, amount: int) -> Tuple[bool, str]:
         """입찰 금액의 유효성을 검사합니다."""
@@ -181,9 +228,8 @@ class AuctionManager:
         if amount < min_bid:
             return False, f"최소 입찰가는 ${min_bid}입니다."
         
-        # 입찰 가능한 팀이 있는지 확인
-        affordable_teams = self.get_affordable_teams(amount)
-        if not affordable_teams:
+        # 입찰 가능한 팀이 있는지 확인 (최대 남은 예산 하나만 비교)
+        if amount > self._get_budget_info()[1]:
             return False, f"${amount}를 입찰할 수 있는 팀이 없습니다."
         
         return True, "유효한 입찰 금액입니다."
@@ -193,20 +239,8 @@ class AuctionManager:
         if not self.data_manager.auction_state.is_active:
             return []
         
-        current_bid = self.data_manager.auction_state.highest_bid
-        suggestions = []
-        
-        # 최소 입찰가
-        min_bid = current_bid + self.min_bid_increment
-        suggestions.append(min_bid)
-        
-        # 추가 추천가 (5, 10, 15, 20 단위)
-        increments = [5, 10, 15, 20]
-        for inc in increments:
-            suggested = current_bid + inc
-            if suggested not in suggestions:
-                suggestions.append(suggested)
-        
-        # 예산 범위 내에서만 반환
-        max_budget = max(self.get_team_budgets().values())
-        return [bid for bid in suggestions if bid <= max_budget]
\ No newline at end of file
+        return list(_suggest_bids(
+            self.data_manager.auction_state.highest_bid,
+            self.min_bid_increment,
+            self._get_budget_info()[1]
+        ))
@@ -1,21 +1,49 @@
+import numpy as np
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
-import time
-import re
-from typing import Dict, List, Optional
-try:
-    from nba_api.stats.endpoints import commonteamroster
-    from nba_api.stats.static import teams
-    NBA_API_AVAILABLE = True
-except ImportError:
-    NBA_API_AVAILABLE = False
+import os
+import unicodedata
+import json
+from io import BytesIO
+from lxml import html
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# 판타지 점수 가중치 (득점/리바운드/어시스트/스틸/블록)
+FANTASY_STAT_COLUMNS = ['points', 'rebounds', 'assists', 'steals', 'blocks']
+FANTASY_STAT_WEIGHTS = np.array([1.0, 1.2, 1.5, 3.0, 3.0])
+
+# 퍼센티지 보너스: NBA 평균 FG% / 3P% / FT% 와 각 가중치
+FANTASY_PCT_COLUMNS = ['field_goal_pct', 'three_point_pct', 'free_throw_pct']
+FANTASY_PCT_AVERAGES = np.array([0.465, 0.365, 0.780])
+FANTASY_PCT_WEIGHTS = np.array([100.0, 50.0, 30.0])
+
+def nba_api_available() -> bool:
+    """nba_api 설치 여부를 확인합니다.
+
+    nba_api는 불러오는 데 시간이 오래 걸리므로 모듈 로드 시점이 아니라
+    로스터 정보를 실제로 수집할 때 불러옵니다.
+    """
+    try:
+        import nba_api.stats.endpoints  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+# 이름 매칭 시 무시하는 접미사
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
+
+# NBA API 로스터 동시 요청 수 (순차 요청 + sleep 대신 제한된 동시성으로 요청 속도 조절)
+ROSTER_FETCH_WORKERS = 8
 
 class BasketballReferenceCollector:
-    def __init__(self):
+    def __init__(self, cache_dir: str = "data/br_cache"):
         self.season_year = '2025'  # 2024-25 시즌
         self.fallback_season_year = '2024'  # 2023-24 시즌 (폴백)
         self.base_url = 'https://www.basketball-reference.com'
+        # 페이지 본문과 ETag/Last-Modified를 저장해 두고 조건부 요청에 사용
+        self.cache_dir = cache_dir
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -45,12 +73,10 @@ class BasketballReferenceCollector:
             url = f"{self.base_url}/leagues/NBA_{season_year}_per_game.html"
             print(f"시도 중인 URL: {url}")
 
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            content = self._get_page(url)
 
-            # pandas로 테이블 읽기
-            tables = pd.read_html(response.content, header=0)
-            df = tables[0]  # 첫 번째 테이블이 선수 스탯
+            # 선수 스탯 테이블만 직접 파싱
+            df = self._parse_per_game_table(content)
 
             # 컬럼 이름을 수동으로 설정 (Basketball Reference 표준 순서)
             expected_columns = [
@@ -80,58 +106,106 @@ class BasketballReferenceCollector:
             print(f"{season_year} 시즌 Basketball Reference 데이터 수집 오류: {e}")
             return pd.DataFrame()
     
+    def _get_page(self, url: str) -> bytes:
+        """페이지를 가져옵니다. 이전에 받은 본문이 있으면 조건부 요청을 보내고 304면 저장된 본문을 사용합니다."""
+        base_name = os.path.join(self.cache_dir, url.rsplit('/', 1)[-1])
+        body_path, meta_path = base_name, base_name + '.json'
+
+        headers = {}
+        if os.path.exists(body_path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+            except (OSError, ValueError):
+                headers = {}
+
+        response = self.session.get(url, headers=headers, timeout=30)
+        if response.status_code == 304:
+            print("페이지가 변경되지 않았습니다. 저장된 데이터를 사용합니다.")
+            with open(body_path, 'rb') as f:
+                return f.read()
+        response.raise_for_status()
+
+        # 다음 요청에서 사용할 본문과 검증 헤더 저장 (실패해도 수집은 계속)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(body_path, 'wb') as f:
+                f.write(response.content)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }, f)
+        except OSError as e:
+            print(f"페이지 캐시 저장 실패: {e}")
+
+        return response.content
+
+    def _parse_per_game_table(self, content: bytes) -> pd.DataFrame:
+        """per game 페이지에서 선수 스탯 테이블(#per_game_stats)의 본문 행만 읽습니다.
+
+        페이지의 모든 테이블을 pandas로 읽고 타입을 추론하는 대신 한 테이블의 셀 텍스트만
+        가져옵니다 (숫자 변환은 _clean_data에서 필요한 컬럼만 수행). 테이블을 찾지 못하면
+        pd.read_html로 폴백합니다.
+        """
+        tree = html.fromstring(content, parser=html.HTMLParser(encoding='utf-8'))
+        rows = tree.xpath('//table[@id="per_game_stats"]/tbody/tr[not(contains(@class, "thead"))]')
+        if not rows:
+            return pd.read_html(BytesIO(content), header=0)[0]
+        
+        data = [[cell.text_content().strip() for cell in row.xpath('./th|./td')] for row in rows]
+        return pd.DataFrame(data)
+    
     def _update_current_teams(self, df: pd.DataFrame) -> pd.DataFrame:
         """NBA API에서 실시간 로스터 정보를 가져와서 팀 정보를 업데이트"""
         print("실시간 NBA 로스터 정보로 팀 데이터 업데이트 중...")
         
-        if not NBA_API_AVAILABLE:
+        if not nba_api_available():
             print("NBA API를 사용할 수 없습니다. Basketball Reference 원본 데이터를 사용합니다.")
             return df
         
+        from nba_api.stats.static import teams
+        
         try:
             # 모든 NBA 팀 정보 가져오기
             nba_teams = teams.get_teams()
             current_rosters = {}
             
             print("NBA 팀별 현재 로스터 정보 수집 중...")
-            for team in nba_teams:
-                team_id = team['id']
-                team_abbr = team['abbreviation']
-                
-                try:
-                    # 현재 시즌 로스터 정보
-                    roster = commonteamroster.CommonTeamRoster(
-                        team_id=team_id, 
-                        season='2024-25'
-                    )
-                    roster_df = roster.get_data_frames()[0]
-                    
-                    if not roster_df.empty:
-                        for _, player in roster_df.iterrows():
-                            player_name = player['PLAYER']
-                            current_rosters[player_name] = team_abbr
-                    
-                    time.sleep(0.1)  # API 제한 준수
-                    
-                except Exception as e:
-                    print(f"{team_abbr} 로스터 정보 가져오기 실패: {e}")
-                    continue
+            # 팀별 요청은 네트워크 대기 시간이 대부분이므로 동시에 보냄 (최대 8개)
+            with ThreadPoolExecutor(max_workers=ROSTER_FETCH_WORKERS) as executor:
+                results = list(executor.map(self._fetch_team_roster, nba_teams))
+            
+            # 팀 순서대로 합쳐서 순차 수집과 같은 결과를 유지
+            for team_abbr, roster_df in results:
+                if roster_df is not None and not roster_df.empty:
+                    # 행마다 Series를 만들지 않고 선수 이름 컬럼으로 한 번에 채움
+                    current_rosters.update(dict.fromkeys(roster_df['PLAYER'], team_abbr))
             
             print(f"수집된 로스터 정보: {len(current_rosters)}명의 선수")
             
+            # 성(마지막 단어) → 로스터 선수 목록 인덱스 (선수마다 전체 로스터를 훑지 않도록)
+            roster_index = self._build_roster_index(current_rosters)
+            
             # Basketball Reference 데이터와 NBA API 로스터 정보 비교 및 업데이트
-            updates_count = 0
-            for idx, row in df.iterrows():
-                br_player_name = row['Player']
-                br_team = row['Tm']
-                
+            # 이름별로 한 번만 매칭한 뒤 바뀐 행만 한 번에 갱신
+            name_to_team = {}
+            for br_player_name in df['Player'].dropna().unique():
                 # 이름 매칭 (다양한 형태로 시도)
-                matched_team = self._find_player_current_team(br_player_name, current_rosters)
-                
-                if matched_team and matched_team != br_team:
-                    df.loc[idx, 'Tm'] = matched_team
-                    print(f"팀 업데이트: {br_player_name} {br_team} → {matched_team}")
-                    updates_count += 1
+                matched_team = self._find_player_current_team(br_player_name, current_rosters, roster_index)
+                if matched_team:
+                    name_to_team[br_player_name] = matched_team
+            
+            new_teams = df['Player'].map(name_to_team)
+            changed = new_teams.notna() & (new_teams != df['Tm'])
+            for br_player_name, br_team, new_team in zip(df.loc[changed, 'Player'], df.loc[changed, 'Tm'], new_teams[changed]):
+                print(f"팀 업데이트: {br_player_name} {br_team} → {new_team}")
+            df.loc[changed, 'Tm'] = new_teams[changed]
+            updates_count = int(changed.sum())
             
             if updates_count > 0:
                 print(f"총 {updates_count}명의 선수 팀 정보가 업데이트되었습니다.")
@@ -145,19 +219,62 @@ class BasketballReferenceCollector:
             print("Basketball Reference 원본 데이터를 사용합니다.")
             return df
     
-    def _find_player_current_team(self, br_name: str, rosters: Dict[str, str]) -> Optional[str]:
+    def _fetch_team_roster(self, team: Dict) -> Tuple[str, Optional[pd.DataFrame]]:
+        """한 팀의 현재 시즌 로스터를 가져옵니다. 실패하면 (팀 약자, None)을 반환합니다."""
+        from nba_api.stats.endpoints import commonteamroster
+        
+        team_abbr = team['abbreviation']
+        try:
+            roster = commonteamroster.CommonTeamRoster(
+                team_id=team['id'],
+                season='2024-25',
+                timeout=30
+            )
+            return team_abbr, roster.get_data_frames()[0]
+        except Exception as e:
+            print(f"{team_abbr} 로스터 정보 가져오기 실패: {e}")
+            return team_abbr, None
+    
+    @staticmethod
+    def _name_tokens(name: str) -> List[str]:
+        """이름 비교용 토큰 목록: 악센트/구두점 제거, 소문자, Jr./III 등 접미사 제외 ('Nikola Jokić' → ['nikola', 'jokic'])"""
+        normalized = unicodedata.normalize('NFKD', name)
+        normalized = ''.join(ch for ch in normalized if not unicodedata.combining(ch))
+        normalized = normalized.lower().replace('.', '').replace("'", '')
+        return [token for token in normalized.split() if token not in NAME_SUFFIXES]
+    
+    def _build_roster_index(self, rosters: Dict[str, str]) -> Dict[str, List[Tuple[List[str], str]]]:
+        """로스터 선수명을 정규화한 성(마지막 단어)별로 묶은 인덱스를 만듭니다."""
+        index = defaultdict(list)
+        for roster_name, team in rosters.items():
+            tokens = self._name_tokens(roster_name)
+            if tokens:
+                index[tokens[-1]].append((tokens, team))
+        return index
+    
+    def _find_player_current_team(self, br_name: str, rosters: Dict[str, str],
+                                  roster_index: Dict[str, List[Tuple[List[str], str]]]) -> Optional[str]:
         """Basketball Reference 선수명과 NBA API 로스터를 매칭"""
         # 정확한 매칭
         if br_name in rosters:
             return rosters[br_name]
         
-        # 부분 매칭 (성씨로)
-        br_last_name = br_name.split()[-1] if ' ' in br_name else br_name
-        for roster_name, team in rosters.items():
-            if br_last_name in roster_name or roster_name in br_name:
-                # 추가 검증: 이름이 비슷한지 확인
-                if len(set(br_name.lower().split()) & set(roster_name.lower().split())) >= 1:
-                    return team
+        # 성씨가 같은 로스터 선수만 확인 (악센트/접미사 차이는 무시)
+        br_tokens = self._name_tokens(br_name)
+        if not br_tokens:
+            return None
+        candidates = roster_index.get(br_tokens[-1], [])
+        
+        # 정규화한 전체 이름이 같은 선수를 우선
+        for roster_tokens, team in candidates:
+            if roster_tokens == br_tokens:
+                return team
+        
+        # 부분 매칭: 성 외에 이름 토큰도 하나 이상 겹치거나, 한쪽 이름이 성 하나뿐인 경우
+        br_token_set = set(br_tokens)
+        for roster_tokens, team in candidates:
+            if len(br_token_set & set(roster_tokens)) >= min(2, len(br_tokens), len(roster_tokens)):
+                return team
         
         return None
     
@@ -187,17 +304,15 @@ class BasketballReferenceCollector:
                 'FT%': 'free_throw_pct'
             }
             
-            # 필요한 컬럼이 있는지 확인
-            available_columns = {}
+            # 있는 컬럼만 새 이름으로 바로 담아 DataFrame 생성 (복사 후 이름 변경을 한 번에)
+            columns = {}
             for old_col, new_col in required_columns.items():
                 if old_col in df.columns:
-                    available_columns[old_col] = new_col
+                    columns[new_col] = df[old_col]
                 else:
                     print(f"경고: {old_col} 컬럼을 찾을 수 없음")
             
-            # 사용 가능한 컬럼만 선택
-            df_clean = df[list(available_columns.keys())].copy()
-            df_clean = df_clean.rename(columns=available_columns)
+            df_clean = pd.DataFrame(columns)
             
             # 중복 제거 (TOT 제거 - 여러 팀을 거친 선수의 총합)
             df_clean = df_clean[df_clean['team'] != 'TOT']
@@ -205,26 +320,24 @@ class BasketballReferenceCollector:
             # 헤더 행 제거 (중간에 끼어있는 헤더)
             df_clean = df_clean[df_clean['name'] != 'Player']
             
-            # 결측치 및 잘못된 데이터 처리
-            numeric_columns = ['games_played', 'minutes_per_game', 'points', 'rebounds', 'assists', 'steals', 'blocks']
-            percentage_columns = ['field_goal_pct', 'three_point_pct', 'free_throw_pct']
-            
-            # 숫자 컬럼 변환
-            for col in numeric_columns:
-                if col in df_clean.columns:
-                    df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(0)
-            
-            # 퍼센티지 컬럼 변환
-            for col in percentage_columns:
-                if col in df_clean.columns:
-                    df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(0)
-            
             # 최소 조건 필터링 (10게임 이상, 5분 이상)
+            # 필터에 필요한 두 컬럼만 먼저 변환해 걸러낸 뒤 나머지 컬럼은 남은 행만 변환
+            for col in ['games_played', 'minutes_per_game']:
+                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(0)
+            
             df_clean = df_clean[
                 (df_clean['games_played'] >= 10) & 
                 (df_clean['minutes_per_game'] >= 5.0)
             ].copy()
             
+            # 결측치 및 잘못된 데이터 처리 (숫자/퍼센티지 컬럼을 한 번에 변환)
+            stat_columns = [
+                col for col in ['points', 'rebounds', 'assists', 'steals', 'blocks',
+                                'field_goal_pct', 'three_point_pct', 'free_throw_pct']
+                if col in df_clean.columns
+            ]
+            df_clean[stat_columns] = df_clean[stat_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
+            
             # 판타지 점수 계산
             df_clean['fantasy_value'] = self._calculate_fantasy_score(df_clean)
             
@@ -232,14 +345,18 @@ class BasketballReferenceCollector:
             df_clean = df_clean.sort_values('fantasy_value', ascending=False).reset_index(drop=True)
             df_clean['fantasy_rank'] = df_clean.index + 1
             
-            # player_id 생성 (이름 기반 해시)
-            df_clean['player_id'] = df_clean['name'].apply(lambda x: hash(x) % 1000000)
+            # player_id 생성 (이름 기반 해시, 프로세스가 바뀌어도 같은 값)
+            name_hashes = pd.util.hash_pandas_object(df_clean['name'], index=False)
+            df_clean['player_id'] = (name_hashes % 1000000).astype('int64')
             
             # 드래프트 관련 컬럼 추가
             df_clean['draft_status'] = 'available'
             df_clean['draft_price'] = 0
             df_clean['draft_team'] = ''
             
+            # 값 종류가 적은 문자열 컬럼은 범주형으로 (저장/필터링/표시 모두 코드 기반)
+            df_clean = df_clean.astype({'team': 'category', 'position': 'category', 'draft_status': 'category'})
+            
             return df_clean
             
         except Exception as e:
@@ -248,26 +365,16 @@ class BasketballReferenceCollector:
     
     def _calculate_fantasy_score(self, df: pd.DataFrame) -> pd.Series:
         """표준 9-카테고리 판타지 점수를 계산합니다."""
-        # 기본 스탯 점수
-        score = (
-            df['points'] * 1.0 +
-            df['rebounds'] * 1.2 +
-            df['assists'] * 1.5 +
-            df['steals'] * 3.0 +
-            df['blocks'] * 3.0
-        )
-        
-        # 퍼센티지 보너스/패널티 (리그 평균 기준)
-        fg_avg = 0.465  # NBA 평균 FG%
-        three_avg = 0.365  # NBA 평균 3P%
-        ft_avg = 0.780  # NBA 평균 FT%
+        # 기본 스탯 점수: (N x 5) 스탯 행렬 x 가중치 벡터
+        stats = df[FANTASY_STAT_COLUMNS].to_numpy(dtype=np.float64)
+        score = stats @ FANTASY_STAT_WEIGHTS
         
-        # 퍼센티지 보너스 (충분한 시도가 있을 때만)
-        score += (df['field_goal_pct'] - fg_avg) * 100 * (df['minutes_per_game'] / 30)
-        score += (df['three_point_pct'] - three_avg) * 50 * (df['minutes_per_game'] / 30)
-        score += (df['free_throw_pct'] - ft_avg) * 30 * (df['minutes_per_game'] / 30)
+        # 퍼센티지 보너스/패널티 (리그 평균 기준, 출전 시간 30분 기준으로 비례)
+        pct = df[FANTASY_PCT_COLUMNS].to_numpy(dtype=np.float64) - FANTASY_PCT_AVERAGES
+        minutes_factor = df['minutes_per_game'].to_numpy(dtype=np.float64) / 30
+        score += (pct @ FANTASY_PCT_WEIGHTS) * minutes_factor
         
-        return score.clip(lower=0)  # 음수 방지
+        return pd.Series(np.clip(score, 0, None), index=df.index)  # 음수 방지
     
     def get_team_abbreviations(self) -> Dict[str, str]:
         """팀 약자 매핑을 반환합니다."""
@@ -1,9 +1,22 @@
+import atexit
+import hashlib
 import json
+import itertools
+import threading
+import time
+import weakref
+import numpy as np
 import pandas as pd
 import os
 from datetime import datetime
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+
+# orjson이 설치되어 있으면 상태 파일 인코딩/디코딩에 사용 (없으면 표준 json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 @dataclass
 class Player:
@@ -27,19 +40,30 @@ class Team:
     name: str
     budget_left: int
     players: List[Dict]
+    total_spent: int = 0  # 낙찰가 합계 (add_player에서 누적)
     
-    def add_player(self, player: Player, price: int):
-        self.players.append({
-            'name': player.name,
-            'position': player.position,
+    def add_player(self, player: Dict, price: int):
+        """낙찰된 선수를 로스터에 추가합니다. player는 name, position과 스탯 키를 가진 딕셔너리입니다."""
+        entry = {
+            'name': player['name'],
+            'position': player['position'],
             'price': price,
-            'points': player.points,
-            'rebounds': player.rebounds,
-            'assists': player.assists,
-            'steals': player.steals,
-            'blocks': player.blocks
-        })
+            'points': player['points'],
+            'rebounds': player['rebounds'],
+            'assists': player['assists'],
+            'steals': player['steals'],
+            'blocks': player['blocks']
+        }
+        # 드래프트된 선수 정보는 바뀌지 않으므로 로스터 표시 문자열을 미리 만들어 둠
+        entry['display'] = self.format_player(entry)
+        self.players.append(entry)
         self.budget_left -= price
+        self.total_spent += price
+
+    @staticmethod
+    def format_player(entry: Dict) -> str:
+        """로스터 표시용 문자열을 반환합니다. 예: 'LeBron James (SF) $30'"""
+        return f"{entry['name']} ({entry['position']}) ${entry['price']}"
 
 @dataclass
 class AuctionState:
@@ -56,10 +80,65 @@ class LeagueSettings:
     league_name: str = "NBA Fantasy League"
     total_teams: int = 12
 
+# update_league_settings에서 받을 수 있는 설정 이름
+LEAGUE_SETTING_FIELDS = frozenset(f.name for f in fields(LeagueSettings))
+
+# 드래프트 결과 내보내기 컬럼
+EXPORT_COLUMNS = ['name', 'team', 'position', 'draft_status',
+                  'draft_price', 'draft_team', 'points', 'rebounds',
+                  'assists', 'steals', 'blocks', 'fantasy_rank']
+
+# 선수 스탯 컬럼 (메모리 절약을 위해 float32로 로드)
+STAT_COLUMNS = ['points', 'rebounds', 'assists', 'steals', 'blocks']
+
+# load_players에서 적용할 컬럼별 dtype
+PLAYER_DTYPES = {
+    **{col: 'float32' for col in STAT_COLUMNS},
+    'fantasy_rank': 'int16',
+    'draft_price': 'int16',
+    'team': 'category',
+    'position': 'category',
+    'draft_status': pd.CategoricalDtype(['available', 'drafted']),
+    'draft_team': 'category',
+}
+
+# 입찰처럼 경매 상태만 바뀌는 저장을 모아서 쓰는 간격 (초)
+SAVE_DEBOUNCE_SECONDS = 0.1
+
+# 프로세스 전체에서 유일한 버전 번호 (DataManager가 새로 만들어져도 재사용되지 않음)
+_version_counter = itertools.count(1)
+
+# 지연 저장이 예약된 DataManager들 (모든 인스턴스가 하나의 백그라운드 스레드를 공유)
+_pending_saves = weakref.WeakSet()
+_pending_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flush_thread = None
+
+def _flush_pending_saves():
+    """예약된 저장이 있는 모든 DataManager의 상태를 씁니다."""
+    with _pending_lock:
+        managers = list(_pending_saves)
+        _pending_saves.clear()
+    for manager in managers:
+        manager.flush_state()
+
+def _flush_loop():
+    """예약된 저장을 SAVE_DEBOUNCE_SECONDS 간격으로 모아서 씁니다."""
+    while True:
+        _flush_wakeup.wait()
+        time.sleep(SAVE_DEBOUNCE_SECONDS)
+        _flush_wakeup.clear()
+        _flush_pending_saves()
+
+# 종료 직전에 남은 변경 사항 저장
+atexit.register(_flush_pending_saves)
+
 class DataManager:
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
-        self.players_file = os.path.join(data_dir, "players.csv")
+        self.players_file = os.path.join(data_dir, "players.parquet")
+        # 이전 버전의 CSV 선수 데이터 (Parquet 파일이 없을 때 한 번만 변환)
+        self.legacy_players_file = os.path.join(data_dir, "players.csv")
         self.state_file = os.path.join(data_dir, "state.json")
         
         # 데이터 디렉토리 생성
@@ -70,6 +149,36 @@ class DataManager:
         self.auction_state = AuctionState()
         self.teams = {}
         
+        # 데이터가 변경될 때마다 증가하는 버전 (캐시 키로 사용)
+        # players_version은 선수 데이터(players.parquet)가 바뀔 때만,
+        # teams_version은 팀 구성(선수/예산/이름)이 바뀔 때만 갱신됨 (입찰만으로는 그대로)
+        self.version = next(_version_counter)
+        self.players_version = self.version
+        self.teams_version = self.version
+        # 인스턴스마다 다른 값 (이 DataManager에 연결된 객체를 캐시할 때 키로 사용)
+        self.instance_id = self.version
+        
+        # 마지막으로 읽거나 쓴 상태 파일의 (mtime_ns, size) - 변경이 없으면 다시 읽지 않음
+        self._state_stamp = None
+        # 마지막으로 쓴 상태 내용의 해시 (last_updated 제외) - 같으면 다시 쓰지 않음
+        self._state_digest = None
+        
+        # 지연 저장 (경매 시작/입찰/취소): 변경 표시 후 공유 백그라운드 스레드가 모아서 한 번에 씀
+        self._dirty = threading.Event()
+        self._save_lock = threading.Lock()
+        
+        # 선수 데이터 메모리 캐시 ((mtime_ns, size), DataFrame) - 파일이 바뀔 때만 다시 읽음
+        self._players_cache = None
+        
+        # 선수 이름 → 캐시된 DataFrame의 행 위치 (선수 캐시가 바뀔 때 함께 무효화)
+        self._name_index = None
+        
+        # 선수 수 캐시 (players_version, {'total', 'available', 'drafted'})
+        self._player_counts = None
+        
+        # 검색용 인덱스 (players_version, 사용 가능한 선수, 정렬된 검색 키, 키별 행 위치)
+        self._search_index = None
+        
         # 저장된 상태가 있으면 로드, 없으면 기본 팀 생성
         self._load_or_initialize()
     
@@ -100,35 +209,116 @@ class DataManager:
             )
         return teams
     
+    def _bump_version(self, players_changed: bool = False, teams_changed: bool = False):
+        """데이터 변경을 알리기 위해 버전을 갱신합니다."""
+        self.version = next(_version_counter)
+        if players_changed:
+            self.players_version = self.version
+        if teams_changed:
+            self.teams_version = self.version
+    
     def load_players(self) -> pd.DataFrame:
-        """선수 데이터를 불러옵니다."""
+        """선수 데이터를 불러옵니다. 파일이 바뀌지 않았으면 메모리에 캐시된 데이터의 복사본을 반환합니다."""
+        return self._get_players_df().copy()
+    
+    def _get_players_df(self) -> pd.DataFrame:
+        """캐시된 선수 DataFrame을 반환합니다. 호출자는 수정하지 말아야 합니다."""
+        stamp = self._get_file_stamp(self.players_file)
+        if stamp is None and self._migrate_legacy_players():
+            stamp = self._get_file_stamp(self.players_file)
+        if self._players_cache is None or self._players_cache[0] != stamp:
+            # 다른 DataManager(다른 페이지/세션)가 파일을 만들거나 바꾼 경우에도 버전을 갱신
+            changed_elsewhere = self._players_cache is not None
+            df = self._read_players_file() if stamp is not None else pd.DataFrame()
+            self._players_cache = (stamp, df)
+            self._name_index = None
+            if changed_elsewhere:
+                self._bump_version(players_changed=True)
+        return self._players_cache[1]
+    
+    def refresh_players(self):
+        """선수 데이터 파일이 다른 DataManager에 의해 바뀌었는지 확인합니다.
+        
+        바뀌었으면 다시 읽고 players_version을 올리므로, 버전을 키로 쓰는
+        캐시를 사용하기 전에 호출해야 합니다.
+        """
+        self._get_players_df()
+    
+    def _get_name_index(self) -> Dict[str, int]:
+        """선수 이름 → 행 위치 딕셔너리를 반환합니다 (같은 이름이 여러 명이면 첫 번째 행)."""
+        df = self._get_players_df()
+        if self._name_index is None:
+            names = df['name'].tolist() if not df.empty else []
+            self._name_index = {}
+            for pos, name in enumerate(names):
+                self._name_index.setdefault(name, pos)
+        return self._name_index
+    
+    def _read_players_file(self) -> pd.DataFrame:
+        """players.parquet를 읽고 dtype을 적용합니다."""
         try:
-            if os.path.exists(self.players_file):
-                df = pd.read_csv(self.players_file, encoding='utf-8')
-                # Ensure proper data types
-                if not df.empty:
-                    df['draft_price'] = df['draft_price'].astype('int64')
-                    df['draft_team'] = df['draft_team'].astype('string')
-                return df
-            else:
-                return pd.DataFrame()
+            df = pd.read_parquet(self.players_file)
+            return self._apply_player_dtypes(df)
         except Exception as e:
             print(f"선수 데이터 로드 중 오류: {e}")
             return pd.DataFrame()
     
+    @staticmethod
+    def _apply_player_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """스탯은 float32, 순위/가격은 int16, 범주형 컬럼은 category로 변환합니다."""
+        if df.empty:
+            return df
+        # 이미 맞는 dtype인 컬럼은 건너뜀 (캐시에서 꺼낸 데이터를 저장할 때는 변환할 것이 거의 없음)
+        dtypes = {col: dtype for col, dtype in PLAYER_DTYPES.items()
+                  if col in df.columns and df[col].dtype != dtype}
+        return df.astype(dtypes) if dtypes else df
+    
+    def _migrate_legacy_players(self) -> bool:
+        """CSV 선수 데이터만 있으면 Parquet으로 변환합니다. 변환했으면 True."""
+        if not os.path.exists(self.legacy_players_file):
+            return False
+        try:
+            # Arrow CSV 리더는 여러 스레드로 파싱함
+            df = pd.read_csv(self.legacy_players_file, encoding='utf-8', engine='pyarrow')
+            self._apply_player_dtypes(df).to_parquet(self.players_file, index=False, compression='zstd')
+            return True
+        except Exception as e:
+            print(f"CSV 선수 데이터 변환 중 오류: {e}")
+            return False
+    
     def save_players(self, df: pd.DataFrame):
-        """선수 데이터를 저장합니다."""
+        """선수 데이터를 저장합니다. 저장한 데이터를 바로 캐시에 넣어 다시 읽지 않습니다."""
         try:
-            df.to_csv(self.players_file, index=False, encoding='utf-8')
+            df = self._apply_player_dtypes(df).reset_index(drop=True)
+            df.to_parquet(self.players_file, index=False, compression='zstd')
+            self._players_cache = (self._get_file_stamp(self.players_file), df)
         except Exception as e:
             print(f"선수 데이터 저장 중 오류: {e}")
+            self._players_cache = None
+        finally:
+            self._name_index = None
+            self._bump_version(players_changed=True)
+    
+    @staticmethod
+    def _get_file_stamp(path: str):
+        """파일의 (mtime_ns, size)를 반환합니다. 파일이 없으면 None."""
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
     
     def load_state(self):
-        """드래프트 상태를 불러옵니다."""
+        """드래프트 상태를 불러옵니다. 마지막으로 읽거나 쓴 뒤 파일이 바뀌지 않았으면 건너뜁니다.
+        
+        선수 데이터 파일도 함께 확인하여 다른 DataManager가 쓴 내용을 반영합니다.
+        """
+        self.refresh_players()
         try:
-            if os.path.exists(self.state_file):
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+            stamp = self._get_file_stamp(self.state_file)
+            # 아직 쓰지 않은 예약 저장이 있으면 메모리 상태가 더 최신임
+            if stamp is not None and stamp != self._state_stamp and not self._dirty.is_set():
+                data = self._read_state_file()
                 
                 # 리그 설정 복원
                 if 'league_settings' in data:
@@ -145,10 +335,15 @@ class DataManager:
                 if 'teams' in data:
                     self.teams = {}
                     for team_name, team_data in data['teams'].items():
+                        # 표시 문자열이 없는 이전 버전 상태 파일 호환
+                        for entry in team_data['players']:
+                            if 'display' not in entry:
+                                entry['display'] = Team.format_player(entry)
                         self.teams[team_name] = Team(
                             name=team_data['name'],
                             budget_left=team_data['budget_left'],
-                            players=team_data['players']
+                            players=team_data['players'],
+                            total_spent=sum(entry['price'] for entry in team_data['players'])
                         )
                 
                 # 경매 상태 복원
@@ -160,51 +355,125 @@ class DataManager:
                         highest_bidder=auction_data.get('highest_bidder', ''),
                         is_active=auction_data.get('is_active', False)
                     )
+                
+                self._state_stamp = stamp
+                self._bump_version(teams_changed=True)
         
         except Exception as e:
             print(f"상태 로드 중 오류: {e}")
     
-    def save_state(self):
-        """현재 드래프트 상태를 저장합니다."""
+    def _read_state_file(self) -> Dict:
+        """상태 파일을 읽어 딕셔너리로 반환합니다."""
+        if orjson is not None:
+            with open(self.state_file, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save_state(self, teams_changed: bool = True):
+        """현재 드래프트 상태를 바로 저장합니다 (대기 중인 지연 저장도 함께 처리).
+        
+        경매 상태만 바뀐 경우에는 schedule_save()를 사용하세요.
+        """
+        try:
+            with self._save_lock:
+                self._dirty.clear()
+                self._write_state()
+        finally:
+            self._bump_version(teams_changed=teams_changed)
+    
+    def schedule_save(self, teams_changed: bool = False):
+        """상태 저장을 예약합니다 (경매 시작/입찰/취소용).
+        
+        버전은 바로 갱신되지만 파일 쓰기는 SAVE_DEBOUNCE_SECONDS 동안 모아서
+        모든 DataManager가 공유하는 백그라운드 스레드가 한 번만 수행합니다.
+        teams_changed=False이면 teams_version이 유지되어 팀 테이블 캐시를
+        그대로 사용할 수 있습니다.
+        """
+        global _flush_thread
+        self._dirty.set()
+        with _pending_lock:
+            _pending_saves.add(self)
+            if _flush_thread is None:
+                _flush_thread = threading.Thread(target=_flush_loop, daemon=True)
+                _flush_thread.start()
+        _flush_wakeup.set()
+        self._bump_version(teams_changed=teams_changed)
+    
+    def flush_state(self):
+        """예약된 상태 저장이 있으면 지금 바로 씁니다.
+        
+        마지막으로 읽거나 쓴 뒤 다른 DataManager가 상태 파일을 바꿨다면 예약된
+        변경이 오래된 상태를 기준으로 한 것이므로 쓰지 않고 버립니다
+        (다음 load_state에서 파일 내용을 읽음).
+        """
+        with self._save_lock:
+            if not self._dirty.is_set():
+                return
+            self._dirty.clear()
+            if self._get_file_stamp(self.state_file) != self._state_stamp:
+                return
+            self._write_state()
+    
+    def _write_state(self):
+        """상태 파일을 씁니다. _save_lock을 잡은 상태에서 호출해야 합니다.
+        
+        내용(last_updated 제외)이 마지막으로 쓴 것과 같고 파일도 그대로이면 쓰지 않습니다.
+        임시 파일에 쓴 뒤 os.replace로 바꿔치기하므로 읽는 쪽에서 반쯤 쓰인 파일을 보지 않습니다.
+        """
         try:
             data = {
-                'league_settings': asdict(self.league_settings),
-                'teams': {name: asdict(team) for name, team in self.teams.items()},
-                'auction_state': asdict(self.auction_state),
-                'last_updated': datetime.now().isoformat()
+                # asdict는 필드를 재귀적으로 deepcopy하므로 필드 딕셔너리를 그대로 사용
+                'league_settings': vars(self.league_settings),
+                'teams': {name: vars(team) for name, team in self.teams.items()},
+                'auction_state': vars(self.auction_state)
             }
             
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            digest = hashlib.blake2b(self._encode_state(data), digest_size=16).digest()
+            if digest == self._state_digest and self._get_file_stamp(self.state_file) == self._state_stamp:
+                return
+            
+            data['last_updated'] = datetime.now().isoformat()
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(self._encode_state(data))
+            os.replace(tmp_file, self.state_file)
+            
+            # 방금 쓴 파일은 다음 load_state에서 다시 읽을 필요가 없음
+            self._state_stamp = self._get_file_stamp(self.state_file)
+            self._state_digest = digest
         
         except Exception as e:
             print(f"상태 저장 중 오류: {e}")
     
+    @staticmethod
+    def _encode_state(data: Dict) -> bytes:
+        """상태 딕셔너리를 들여쓰기된 JSON 바이트로 인코딩합니다."""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    
     def start_auction(self, player_name: str):
         """특정 선수의 경매를 시작합니다."""
         self.auction_state.current_player = player_name
         self.auction_state.highest_bid = 1  # 최소 입찰가
         self.auction_state.highest_bidder = ''
         self.auction_state.is_active = True
-        self.save_state()
+        self.schedule_save()
     
     def place_bid(self, team_name: str, amount: int) -> bool:
         """입찰을 진행합니다."""
-        if not self.auction_state.is_active:
+        state = self.auction_state
+        if not state.is_active:
             return False
         
-        if team_name not in self.teams:
+        team = self.teams.get(team_name)
+        if team is None or team.budget_left < amount or amount <= state.highest_bid:
             return False
         
-        if self.teams[team_name].budget_left < amount:
-            return False
-        
-        if amount <= self.auction_state.highest_bid:
-            return False
-        
-        self.auction_state.highest_bid = amount
-        self.auction_state.highest_bidder = team_name
-        self.save_state()
+        state.highest_bid = amount
+        state.highest_bidder = team_name
+        self.schedule_save()
         return True
     
     def finalize_auction(self) -> bool:
@@ -212,68 +481,105 @@ class DataManager:
         if not self.auction_state.is_active or not self.auction_state.highest_bidder:
             return False
         
-        # 선수 데이터 업데이트
-        df = self.load_players()
-        if not df.empty:
-            player_idx = df[df['name'] == self.auction_state.current_player].index
-            if len(player_idx) > 0:
-                df.loc[player_idx[0], 'draft_status'] = 'drafted'
-                df.loc[player_idx[0], 'draft_price'] = int(self.auction_state.highest_bid)
-                df.loc[player_idx[0], 'draft_team'] = str(self.auction_state.highest_bidder)
-                
-                # 팀에 선수 추가
-                player_data = df.loc[player_idx[0]]
-                player = Player(
-                    player_id=int(player_data['player_id']),
-                    name=player_data['name'],
-                    team=player_data['team'],
-                    position=player_data['position'],
-                    points=float(player_data['points']),
-                    rebounds=float(player_data['rebounds']),
-                    assists=float(player_data['assists']),
-                    steals=float(player_data['steals']),
-                    blocks=float(player_data['blocks']),
-                    fantasy_value=float(player_data['fantasy_value']),
-                    fantasy_rank=int(player_data['fantasy_rank'])
-                )
-                
-                self.teams[self.auction_state.highest_bidder].add_player(
-                    player, self.auction_state.highest_bid
-                )
-                
-                self.save_players(df)
+        # 선수 데이터 업데이트 (이름 → 행 위치 딕셔너리로 전체 컬럼 비교 없이 찾기)
+        pos = self._get_name_index().get(self.auction_state.current_player)
+        if pos is not None:
+            df = self.load_players()
+            col = df.columns.get_loc
+            df.iat[pos, col('draft_status')] = 'drafted'
+            df.iat[pos, col('draft_price')] = int(self.auction_state.highest_bid)
+            bidder = str(self.auction_state.highest_bidder)
+            if bidder not in df['draft_team'].cat.categories:
+                df['draft_team'] = df['draft_team'].cat.add_categories([bidder])
+            df.iat[pos, col('draft_team')] = bidder
+            
+            # 팀에 선수 추가
+            player = {'name': df.iat[pos, col('name')], 'position': df.iat[pos, col('position')]}
+            for stat in STAT_COLUMNS:
+                # float32 스탯을 float64로 되돌릴 때 생기는 오차 제거 (29.6 → 29.600000381...)
+                player[stat] = round(float(df.iat[pos, col(stat)]), 4)
+            
+            self.teams[self.auction_state.highest_bidder].add_player(
+                player, self.auction_state.highest_bid
+            )
+            
+            self.save_players(df)
         
         # 경매 상태 초기화
         self.auction_state = AuctionState()
         self.save_state()
         return True
     
-    def get_available_players(self) -> pd.DataFrame:
-        """사용 가능한 선수 목록을 반환합니다."""
-        df = self.load_players()
-        if df.empty:
-            return df
-        return df[df['draft_status'] == 'available'].copy()
+    def get_available_players(self, copy: bool = True) -> pd.DataFrame:
+        """사용 가능한 선수 목록을 반환합니다. 결과를 수정하지 않는 호출자는 copy=False로 복사를 생략할 수 있습니다."""
+        return self._filter_by_draft_status('available', copy)
     
-    def get_drafted_players(self) -> pd.DataFrame:
-        """드래프트된 선수 목록을 반환합니다."""
-        df = self.load_players()
-        if df.empty:
-            return df
-        return df[df['draft_status'] == 'drafted'].copy()
+    def get_drafted_players(self, copy: bool = True) -> pd.DataFrame:
+        """드래프트된 선수 목록을 반환합니다. 결과를 수정하지 않는 호출자는 copy=False로 복사를 생략할 수 있습니다."""
+        return self._filter_by_draft_status('drafted', copy)
+    
+    def _filter_by_draft_status(self, status: str, copy: bool) -> pd.DataFrame:
+        """캐시된 선수 데이터에서 draft_status로 필터링합니다.
+        
+        copy=False이면 결과가 캐시와 데이터를 공유할 수 있으므로 (선수 데이터가 비어 있으면
+        캐시 자체를 반환) 호출자는 결과를 수정하지 말아야 합니다.
+        """
+        df = self._get_players_df()
+        if not df.empty:
+            df = df[df['draft_status'] == status]
+        return df.copy() if copy else df
+    
+    def get_player_counts(self) -> Dict[str, int]:
+        """전체/사용 가능/드래프트된 선수 수를 반환합니다 (선수 데이터 버전별로 한 번만 계산)."""
+        df = self._get_players_df()
+        if self._player_counts is None or self._player_counts[0] != self.players_version:
+            counts = df['draft_status'].value_counts() if not df.empty else pd.Series(dtype='int64')
+            self._player_counts = (self.players_version, {
+                'total': len(df),
+                'available': int(counts.get('available', 0)),
+                'drafted': int(counts.get('drafted', 0))
+            })
+        return self._player_counts[1]
+    
+    def _get_search_index(self):
+        """사용 가능한 선수와 정렬된 이름 검색 키를 버전별로 캐시하여 반환합니다.
+        
+        검색 키는 소문자 이름에서 각 단어로 시작하는 접미사이며
+        ('lebron james' → 'lebron james', 'james'), 정렬해 두어
+        np.searchsorted로 접두사 범위를 찾을 수 있습니다.
+        """
+        self.refresh_players()
+        if self._search_index is None or self._search_index[0] != self.players_version:
+            available_players = self.get_available_players(copy=False)
+            names_lower = (
+                available_players['name'].str.lower().tolist()
+                if not available_players.empty else []
+            )
+            suffixes = [
+                (name[start:], pos)
+                for pos, name in enumerate(names_lower)
+                for start in [0] + [i + 1 for i, ch in enumerate(name) if ch == ' ']
+            ]
+            keys = np.array([key for key, _ in suffixes], dtype=str)
+            positions = np.array([pos for _, pos in suffixes], dtype=np.int64)
+            order = keys.argsort(kind='stable')
+            self._search_index = (self.players_version, available_players, keys[order], positions[order])
+        return self._search_index[1:]
     
     def search_players(self, query: str, limit: int = 10) -> pd.DataFrame:
-        """선수 이름으로 검색합니다."""
-        available_players = self.get_available_players()
+        """선수 이름(각 단어의 앞부분)으로 검색합니다."""
+        available_players, keys, positions = self._get_search_index()
         if available_players.empty:
             return available_players
         
-        # 이름에 쿼리가 포함된 선수들 찾기
-        filtered = available_players[
-            available_players['name'].str.contains(query, case=False, na=False)
-        ]
+        # 쿼리로 시작하는 검색 키 범위 [lo, hi)를 이진 탐색으로 찾기
+        query = query.strip().lower()
+        lo = np.searchsorted(keys, query, side='left')
+        hi = np.searchsorted(keys, query + '\U0010ffff', side='left')
         
-        return filtered.head(limit)
+        # 한 선수가 여러 키로 매칭될 수 있으므로 중복 제거 (원래 순서 = 판타지 순위)
+        rows = np.unique(positions[lo:hi])
+        return available_players.iloc[rows[:limit]]
     
     def export_draft_results(self, filename: str = None) -> str:
         """드래프트 결과를 CSV로 내보냅니다."""
@@ -287,9 +593,7 @@ class DataManager:
             df = self.load_players()
             if not df.empty:
                 # 드래프트 결과만 필터링
-                export_df = df[['name', 'team', 'position', 'draft_status', 
-                              'draft_price', 'draft_team', 'points', 'rebounds', 
-                              'assists', 'steals', 'blocks', 'fantasy_rank']].copy()
+                export_df = df[EXPORT_COLUMNS].copy()
                 
                 export_df.to_csv(filepath, index=False, encoding='utf-8')
                 return filepath
@@ -302,19 +606,26 @@ class DataManager:
     
     def get_team_summary(self) -> Dict:
         """모든 팀의 요약 정보를 반환합니다."""
-        summary = {}
-        for team_name, team in self.teams.items():
-            total_spent = 200 - team.budget_left
-            player_count = len(team.players)
-            
-            summary[team_name] = {
+        # 사용한 예산은 add_player에서 누적한 값을 사용 (시작 예산을 200으로 가정하지 않음)
+        return {
+            team_name: {
                 'budget_left': team.budget_left,
-                'total_spent': total_spent,
-                'player_count': player_count,
+                'total_spent': team.total_spent,
+                'player_count': len(team.players),
                 'players': team.players
             }
+            for team_name, team in self.teams.items()
+        }
+    
+    def get_team_stat_totals(self, columns: List[str] = None) -> pd.DataFrame:
+        """드래프트된 선수들의 팀별 스탯 합계를 반환합니다 (인덱스: 팀 이름)."""
+        if columns is None:
+            columns = ['points', 'rebounds', 'assists']
         
-        return summary
+        drafted = self.get_drafted_players(copy=False)
+        if drafted.empty:
+            return pd.DataFrame(columns=columns, dtype='float64')
+        return drafted.groupby('draft_team', observed=True)[columns].sum()
     
     def update_team_name(self, old_name: str, new_name: str) -> bool:
         """팀 이름을 변경합니다."""
@@ -330,9 +641,16 @@ class DataManager:
         del self.teams[old_name]
         
         # 선수 데이터의 draft_team도 업데이트
-        df = self.load_players()
-        if not df.empty:
-            df.loc[df['draft_team'] == old_name, 'draft_team'] = new_name
+        # draft_team 컬럼 자체로 해당 팀 선수 행을 찾음 (해당 팀 선수가 없으면 저장도 생략)
+        cached = self._get_players_df()
+        if not cached.empty and (cached['draft_team'] == old_name).any():
+            df = self.load_players()
+            categories = df['draft_team'].cat.categories
+            if new_name not in categories:
+                # 범주 이름만 바꾸면 행 데이터(코드)는 그대로 두고 해당 팀 선수 전체가 새 이름이 됨
+                df['draft_team'] = df['draft_team'].cat.rename_categories({old_name: new_name})
+            else:
+                df.loc[df['draft_team'] == old_name, 'draft_team'] = new_name
             self.save_players(df)
         
         # 경매 상태의 highest_bidder도 업데이트
@@ -354,7 +672,7 @@ class DataManager:
             
             # 설정 업데이트
             for key, value in kwargs.items():
-                if hasattr(self.league_settings, key):
+                if key in LEAGUE_SETTING_FIELDS:
                     setattr(self.league_settings, key, value)
             
             # 팀 수 변경 시 처리
@@ -367,7 +685,8 @@ class DataManager:
                 for name, team in self.teams.items():
                     existing_teams_data[name] = {
                         'budget_left': team.budget_left,
-                        'players': team.players.copy()
+                        'players': team.players.copy(),
+                        'total_spent': team.total_spent
                     }
                 
                 # 새 팀 구조 생성
@@ -378,6 +697,7 @@ class DataManager:
                     if name in existing_teams_data:
                         team.budget_left = existing_teams_data[name]['budget_left']
                         team.players = existing_teams_data[name]['players']
+                        team.total_spent = existing_teams_data[name]['total_spent']
             
             # 예산 변경 시 처리 (팀 수 변경과 별개로 처리)
             if 'team_budget' in kwargs and kwargs['team_budget'] != old_team_budget:
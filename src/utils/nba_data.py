@@ -1,26 +1,27 @@
 import pandas as pd
-import requests
-import time
-import json
 from typing import Dict, List, Optional
-from .basketball_reference import BasketballReferenceCollector
-
-try:
-    from nba_api.stats.endpoints import commonallplayers
-    NBA_API_AVAILABLE = True
-except ImportError:
-    NBA_API_AVAILABLE = False
-    print("NBA API가 설치되지 않았습니다. Basketball Reference만 사용합니다.")
 
 class NBADataCollector:
     def __init__(self):
         self.season = '2024-25'
         self.current_season_id = '22024'  # 2024-25 season ID (corrected)
+        self._br_collector = None
+    
+    @property
+    def br_collector(self):
+        """Basketball Reference 수집기 (처음 사용할 때 모듈을 불러오고 한 번만 생성해 HTTP 세션을 재사용)"""
+        if self._br_collector is None:
+            from .basketball_reference import BasketballReferenceCollector
+            self._br_collector = BasketballReferenceCollector()
+        return self._br_collector
         
     def get_all_active_players(self) -> pd.DataFrame:
         """2024-25 시즌 활성 선수 목록을 가져옵니다."""
-        if not NBA_API_AVAILABLE:
+        from .basketball_reference import nba_api_available
+        if not nba_api_available():
             raise Exception("NBA API를 사용할 수 없습니다. nba-api 패키지를 설치하세요.")
+        
+        from nba_api.stats.endpoints import commonallplayers
 
         try:
             print("NBA API에서 선수 목록을 가져오는 중...")
@@ -102,6 +103,8 @@ class NBADataCollector:
     def get_player_stats(self, player_id: int) -> Optional[Dict]:
         """특정 선수의 2024-25 시즌 스탯을 가져옵니다."""
         try:
+            from nba_api.stats.endpoints import playercareerstats
+            
             # 선수 커리어 스탯 가져오기
             career_stats = playercareerstats.PlayerCareerStats(player_id=player_id)
             season_stats = career_stats.get_data_frames()[0]
@@ -185,8 +188,7 @@ class NBADataCollector:
 
         try:
             # Basketball Reference 수집기 사용
-            br_collector = BasketballReferenceCollector()
-            df = br_collector.get_season_stats()
+            df = self.br_collector.get_season_stats()
 
             if df.empty:
                 # 더 구체적인 에러 메시지
@@ -216,11 +218,12 @@ class NBADataCollector:
                 available_cols = [col for col in required_cols if col in df.columns]
 
                 if available_cols:
-                    top10 = df.head(10)[available_cols]
-                    for idx, (_, player) in enumerate(top10.iterrows()):
-                        name = player.get('name', 'Unknown')
-                        team = player.get('team', 'UNK')
-                        rank = player.get('fantasy_rank', idx + 1)
+                    top10 = df.head(10)
+                    # 행마다 Series를 만들지 않도록 컬럼 값을 리스트로 꺼내서 사용
+                    names = top10['name'].tolist() if 'name' in top10.columns else ['Unknown'] * len(top10)
+                    teams = top10['team'].tolist() if 'team' in top10.columns else ['UNK'] * len(top10)
+                    ranks = top10['fantasy_rank'].tolist() if 'fantasy_rank' in top10.columns else range(1, len(top10) + 1)
+                    for rank, name, team in zip(ranks, names, teams):
                         print(f"{rank:2d}. {name:<20} ({team})")
 
             return df
@@ -239,7 +242,7 @@ class NBADataCollector:
     def load_players_data(self, filepath: str = "data/players.csv") -> pd.DataFrame:
         """저장된 선수 데이터를 불러옵니다."""
         try:
-            return pd.read_csv(filepath, encoding='utf-8')
+            return pd.read_csv(filepath, encoding='utf-8', engine='pyarrow')
         except FileNotFoundError:
             print(f"{filepath} 파일을 찾을 수 없습니다.")
             return pd.DataFrame()
\ No newline at end of file